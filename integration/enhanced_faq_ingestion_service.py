@@ -5,14 +5,51 @@ Aktualisierte get_faq_ingestion_service - Spezialisierte Pipeline für Tabellen
 """
 
 import logging
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, Hashable
 
 # Import der spezialisierten Tabellen-Services
 from .table_faq_ingestion_service import create_table_faq_ingestion_service, TableFAQIngestionService
 
 logger = logging.getLogger(__name__)
 
+# Bereits erstellte Tabellen-Pipelines, nur solange sie anderweitig referenziert werden.
+# Jede Pipeline hält ihre Services (und Caches) selbst, daher können deren id()-Werte
+# nicht wiederverwendet werden, solange der Eintrag existiert.
+_table_services: "weakref.WeakValueDictionary[Hashable, TableFAQIngestionService]" = weakref.WeakValueDictionary()
+
+def _option_key(value: Any) -> Hashable:
+    """Schlüssel für einen Optionswert (nicht hashbare Werte wie dict-Caches über ihre Identität)"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('id', id(value))
+
+def _build_table_service(embedding_service,
+                         vector_service,
+                         options: Dict[str, Any]) -> TableFAQIngestionService:
+    """
+    Erstellt die Tabellen-Pipeline einmal pro Konfiguration
+    
+    Schlüssel sind die Identität der Services und die Pipeline-Optionen, sodass
+    wiederholte Aufrufe dieselbe Instanz erhalten, solange sie noch verwendet wird.
+    Alle Optionen werden an create_table_faq_ingestion_service weitergegeben.
+    """
+    key = (id(embedding_service), id(vector_service),
+           frozenset((name, _option_key(value)) for name, value in options.items()))
+    
+    table_service = _table_services.get(key)
+    if table_service is None:
+        table_service = create_table_faq_ingestion_service(
+            embedding_service=embedding_service,
+            vector_service=vector_service,
+            **options
+        )
+        _table_services[key] = table_service
+    return table_service
+
 def get_faq_ingestion_service(service_type: str = "default", **kwargs):
     """
     Erstellt spezialisierte FAQ Ingestion Services basierend auf Service-Type
@@ -32,7 +69,7 @@ def get_faq_ingestion_service(service_type: str = "default", **kwargs):
         - TableExtractionService (statt UTF8ExtractionService)
         - TableChunkingService (statt normaler ChunkingService)
         - AzureOpenAIEmbeddingService (bestehender)
-        - PostgreSQLVectorService (bestehender)
+        - PostgreSQLVectorService (bestehender, Bulk-Speicherung per COPY)
         - Kein SummaryService (nicht benötigt für Tabellen)
         """
         logger.info("🔧 Erstelle spezialisierte Tabellen-Pipeline")
@@ -47,15 +84,19 @@ def get_faq_ingestion_service(service_type: str = "default", **kwargs):
         if not vector_service:
             raise ValueError("vector_service (PostgreSQLVectorService) muss für Tabellen-Pipeline bereitgestellt werden")
         
-        # Spezialisierte Tabellen-Pipeline erstellen
-        table_service = create_table_faq_ingestion_service(
-            embedding_service=embedding_service,
-            vector_service=vector_service,
-            max_chunk_size=kwargs.get('max_chunk_size', 1000),
-            overlap=kwargs.get('overlap', 100)
-        )
+        # Spezialisierte Tabellen-Pipeline erstellen (bzw. wiederverwenden),
+        # alle weiteren Parameter gehen an create_table_faq_ingestion_service
+        options = {
+            'max_chunk_size': 1000,
+            'overlap': 100,
+            'bulk_mode': 'copy',
+            'copy_batch_rows': 10000,
+            **{name: value for name, value in kwargs.items()
+               if name not in ('embedding_service', 'vector_service')}
+        }
+        table_service = _build_table_service(embedding_service, vector_service, options)
         
-        logger.info("✅ Spezialisierte Tabellen-Pipeline erstellt")
+        logger.info("✅ Spezialisierte Tabellen-Pipeline bereitgestellt")
         return table_service
         
     elif service_type == "default":
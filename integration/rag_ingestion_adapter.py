@@ -5,14 +5,22 @@ RAG Ingestion Adapter - Vereinfacht
 Nur Excel-Daten vorbereiten und an bestehenden FAQIngestionService delegieren
 """
 
+import io
+import copy
 import os
+import asyncio
+import hashlib
+import time
 import logging
-import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from contextlib import closing
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union, BinaryIO, Iterator
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 import pandas as pd
+from openpyxl import load_workbook
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -21,7 +29,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Excel-Engine für pd.read_excel: python-calamine (Rust-basiert, liest auch .xls/.xlsb),
+# openpyxl nur als Fallback wenn python-calamine nicht installiert ist
+try:
+    from python_calamine import CalamineWorkbook
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    CalamineWorkbook = None
+    EXCEL_ENGINE = 'openpyxl'
+
+# String-Spalten Arrow-basiert halten (C-Kernels für .str-Operationen), sofern pyarrow installiert ist
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = 'string'
+
+# Zeilen pro Block beim Einlesen von CSV-Dateien
+CSV_CHUNK_ROWS = 10_000
+
+# Dateiendungen, die über die RAG-Tabellenverarbeitung laufen
+TABULAR_EXTENSIONS = frozenset({'.xlsx', '.xls', '.xlsm', '.xlsb', '.csv'})
+
+# Vorkodierte Markdown-Fragmente für den aufbereiteten Excel-Inhalt
+_FRAGE_HEADER = b"\n## Frage "
+_FRAGE_LABEL = b"\n\n**Frage:** "
+_ANTWORT_LABEL = b"\n\n**Antwort:** "
+_KOMMENTAR_LABEL = b"\n\n**Kommentar:** "
+_BLOCK_END = b"\n\n---\n"
+
+@lru_cache(maxsize=32)
+def _diff_columns(columns: tuple, expected_columns: tuple, optional_columns: tuple) -> tuple[tuple, tuple, tuple]:
+    """
+    Vergleicht eine Kopfzeile mit den erwarteten und optionalen Spalten
+    
+    Das Ergebnis hängt nur vom Spalten-Schema ab und wird für wiederkehrende
+    Kopfzeilen (gleiche Vorlage, erneuter Upload) zwischengespeichert.
+    
+    Returns:
+        tuple: (fehlende Pflichtspalten, fehlende optionale Spalten, unbekannte Spalten)
+    """
+    column_set = set(columns)
+    known_columns = set(expected_columns) | set(optional_columns)
+    return (
+        tuple(col for col in expected_columns if col not in column_set),
+        tuple(col for col in optional_columns if col not in column_set),
+        tuple(col for col in columns if col not in known_columns)
+    )
+
+@dataclass(slots=True)
 class ExtendedDocumentMetadata:
     """Erweiterte Dokument-Metadaten für API-Integration"""
     document_id: str
@@ -51,11 +107,17 @@ class RAGProcessingError(Exception):
 
 class RAGProcessingWarning:
     """Warnung bei RAG-Verarbeitung"""
-    def __init__(self, message: str, warning_type: str, details: Dict[str, Any] = None):
+    def __init__(self, message: str, warning_type: str, details: Dict[str, Any] = None,
+                 timestamp_ns: Optional[int] = None):
         self.message = message
         self.warning_type = warning_type
         self.details = details or {}
-        self.timestamp = datetime.now().isoformat()
+        # Zeitpunkt nur als Zahl erfassen (ggf. vom Aufrufer geteilt), formatiert wird erst bei Bedarf
+        self._created_ns = timestamp_ns if timestamp_ns is not None else time.time_ns()
+    
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self._created_ns / 1e9).isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -65,16 +127,51 @@ class RAGProcessingWarning:
             'timestamp': self.timestamp
         }
 
+@dataclass
+class ExcelParseResult:
+    """Ergebnis der synchronen Excel-Verarbeitung"""
+    sheet_name: Optional[str] = None
+    total_rows: Optional[int] = None
+    available_columns: List[str] = field(default_factory=list)
+    missing_columns: List[str] = field(default_factory=list)
+    warnings: List[RAGProcessingWarning] = field(default_factory=list)
+    qa_pairs: List[Dict[str, Any]] = field(default_factory=list)
+    prepared_content: Optional[bytes] = None
+
+@dataclass
+class UploadItem:
+    """Einzelner Upload für die Batch-Ingestion"""
+    filename: str
+    raw_content: bytes
+    document_id: str
+    document_source: str
+    document_class: Optional[str] = None
+    document_mime_type: Optional[str] = None
+    document_internal: Optional[str] = None
+    description: Optional[str] = None
+
 class RAGIngestionAdapter:
     """
     Vereinfachter RAG Adapter
     NUR Excel-Daten vorbereiten und an bestehenden Service delegieren
+    
+    Bietet der bestehende Service zusätzlich
+    ``async_ingest_structured(filename, qa_pairs, sheet_name, documentId, documentSource,
+    documentClass, documentInternal, desc)``, werden die QA-Paare direkt übergeben;
+    der Markdown-Text wird dann weder erzeugt noch vom Service erneut geparst.
     """
     
-    def __init__(self, original_service):
+    def __init__(self, original_service, parse_cache_size: int = 64):
         # Original Service (dein bestehender FAQIngestionService)
         self.original_service = original_service
         
+        # Optionale strukturierte Übergabe der QA-Paare (ohne Markdown-Umweg)
+        self._structured_ingest = getattr(original_service, 'async_ingest_structured', None)
+        
+        # LRU-Cache für Parse-Ergebnisse (Schlüssel: Hash des Dateiinhalts)
+        self.parse_cache_size = parse_cache_size
+        self._parse_cache: OrderedDict[str, ExcelParseResult] = OrderedDict()
+        
         # Erwartete Excel-Spalten
         self.expected_columns = ['Nr.', 'Frage', 'Antwort']
         self.optional_columns = ['Kommentar']
@@ -82,99 +179,191 @@ class RAGIngestionAdapter:
         # Erwartete Tabellenblätter (in Reihenfolge der Priorität)
         self.expected_sheets = ['Test_Chatbot', 'FAQ_DEUTSCH', 'FAQ_English']
         
+        # Spalten-Mengen für schnelle Mengenoperationen (einmalig berechnet)
+        self._expected_set = frozenset(self.expected_columns)
+        self._optional_set = frozenset(self.optional_columns)
+        self._known_set = self._expected_set | self._optional_set
+        
         logger.info("✅ RAG Ingestion Adapter (vereinfacht) erfolgreich initialisiert")
     
-    def _find_valid_sheet(self, excel_file: Path) -> tuple[Optional[str], Optional[pd.DataFrame]]:
+    def _iter_sheet_headers(self, excel_file: Union[Path, BinaryIO]) -> Iterator[tuple[str, List[Any]]]:
+        """
+        Liefert die Kopfzeilen der Tabellenblätter in Prioritätsreihenfolge
+        
+        Erst die erwarteten Tabellenblätter, danach alle übrigen. Jedes Blatt wird
+        höchstens einmal und nur bis zur Kopfzeile gelesen.
+        
+        Args:
+            excel_file: Pfad zur Excel-Datei oder Datei-Objekt
+            
+        Yields:
+            tuple: (sheet_name, Spaltenüberschriften)
+        """
+        try:
+            # openpyxl read-only: Blattnamen stammen aus xl/workbook.xml, Zeilen werden gestreamt
+            wb = load_workbook(excel_file, read_only=True, data_only=True)
+            sheet_names = wb.sheetnames
+        except Exception:
+            # Formate ohne openpyxl-Unterstützung (z.B. .xls, .xlsb) über calamine
+            if CalamineWorkbook is None:
+                raise
+            if hasattr(excel_file, 'seek'):
+                excel_file.seek(0)
+            wb = (CalamineWorkbook.from_path(str(excel_file)) if isinstance(excel_file, (str, Path))
+                  else CalamineWorkbook.from_filelike(excel_file))
+            sheet_names = wb.sheet_names
+        
+        try:
+            logger.info("📋 Verfügbare Tabellenblätter: %s", sheet_names)
+            for sheet_name in self._order_sheets(sheet_names):
+                yield sheet_name, self._read_header(wb, sheet_name)
+        finally:
+            wb.close()
+    
+    def _read_header(self, wb: Any, sheet_name: str) -> List[Any]:
+        """
+        Liest ausschließlich die Kopfzeile eines Tabellenblatts
+        
+        Args:
+            wb: Geöffnete Arbeitsmappe (openpyxl read-only oder calamine)
+            sheet_name: Name des Tabellenblatts
+            
+        Returns:
+            List[Any]: Spaltenüberschriften ohne leere Zellen
+        """
+        if CalamineWorkbook is not None and isinstance(wb, CalamineWorkbook):
+            rows = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False, nrows=1)
+            first_row = rows[0] if rows else ()
+        else:
+            first_row = next(wb[sheet_name].iter_rows(min_row=1, max_row=1, values_only=True), ())
+        return [col for col in first_row if col is not None and col != '']
+    
+    def _order_sheets(self, available_sheets: List[str]) -> List[str]:
+        """Sortiert Tabellenblätter: erwartete Blätter (nach Priorität) zuerst, dann die übrigen"""
+        return ([sheet for sheet in self.expected_sheets if sheet in available_sheets] +
+                [sheet for sheet in available_sheets if sheet not in self.expected_sheets])
+    
+    def _find_valid_sheet(self, excel_file: Union[Path, BinaryIO]) -> tuple[Optional[str], Optional[pd.DataFrame], List[Any]]:
         """
         Findet das erste Tabellenblatt mit der richtigen Struktur
         
+        Prüft die Kopfzeilen in Prioritätsreihenfolge in einem einzigen Durchlauf;
+        vollständig gelesen werden ausschließlich die bekannten Spalten des
+        passenden Tabellenblatts.
+        
         Args:
-            excel_file: Pfad zur Excel-Datei
+            excel_file: Pfad zur Excel-Datei oder Datei-Objekt
             
         Returns:
-            tuple: (sheet_name, dataframe) oder (None, None) wenn kein gültiges Blatt gefunden
+            tuple: (sheet_name, dataframe, alle Spaltenüberschriften) oder (None, None, [])
+                   wenn kein gültiges Blatt gefunden
         """
         try:
-            # Alle Tabellenblätter lesen
-            excel_file_obj = pd.ExcelFile(excel_file)
-            available_sheets = excel_file_obj.sheet_names
-            
-            logger.info(f"📋 Verfügbare Tabellenblätter: {available_sheets}")
+            valid_sheet = None
             
-            # Suche nach dem ersten Blatt mit der richtigen Struktur
-            for sheet_name in self.expected_sheets:
-                if sheet_name in available_sheets:
-                    logger.info(f"🔍 Prüfe Tabellenblatt: {sheet_name}")
-                    
-                    # Blatt lesen
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            with closing(self._iter_sheet_headers(excel_file)) as sheet_headers:
+                for sheet_name, columns in sheet_headers:
+                    logger.info("🔍 Prüfe Tabellenblatt: %s", sheet_name)
                     
                     # Prüfe ob die erwarteten Spalten vorhanden sind
-                    missing_columns = [col for col in self.expected_columns if col not in df.columns]
+                    if self._expected_set.issubset(columns):
+                        valid_sheet = sheet_name
+                        break
                     
-                    if not missing_columns:
-                        logger.info(f"✅ Gültiges Tabellenblatt gefunden: {sheet_name}")
-                        return sheet_name, df
-                    else:
-                        logger.warning(f"⚠️ Tabellenblatt {sheet_name} hat nicht die erwartete Struktur. Fehlende Spalten: {missing_columns}")
-                        logger.info(f"📋 Verfügbare Spalten in {sheet_name}: {list(df.columns)}")
+                    missing_columns = [col for col in self.expected_columns if col not in columns]
+                    if sheet_name in self.expected_sheets:
+                        logger.warning("⚠️ Tabellenblatt %s hat nicht die erwartete Struktur. Fehlende Spalten: %s", sheet_name, missing_columns)
+                    logger.info("📋 Verfügbare Spalten in %s: %s", sheet_name, columns)
             
-            # Wenn kein erwartetes Blatt gefunden, suche in allen Blättern
-            logger.info("🔍 Suche in allen verfügbaren Tabellenblättern...")
-            for sheet_name in available_sheets:
-                logger.info(f"🔍 Prüfe Tabellenblatt: {sheet_name}")
-                
-                # Blatt lesen
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                
-                # Prüfe ob die erwarteten Spalten vorhanden sind
-                missing_columns = [col for col in self.expected_columns if col not in df.columns]
-                
-                if not missing_columns:
-                    logger.info(f"✅ Gültiges Tabellenblatt gefunden: {sheet_name}")
-                    return sheet_name, df
-                else:
-                    logger.info(f"📋 Verfügbare Spalten in {sheet_name}: {list(df.columns)}")
+            if valid_sheet is None:
+                logger.error("❌ Kein Tabellenblatt mit der erwarteten Struktur gefunden")
+                return None, None, []
+            
+            logger.info("✅ Gültiges Tabellenblatt gefunden: %s", valid_sheet)
+            
+            # Nur bekannte Spalten laden, direkt als String-Spalten
+            usecols = [col for col in columns if col in self._known_set]
+            df = pd.read_excel(excel_file, sheet_name=valid_sheet, usecols=usecols, dtype=STRING_DTYPE, engine=EXCEL_ENGINE)
+            return valid_sheet, df, columns
+            
+        except Exception as e:
+            logger.error("❌ Fehler beim Lesen der Excel-Datei: %s", e)
+            return None, None, []
+    
+    def _find_valid_csv(self, csv_file: Union[Path, BinaryIO], sheet_name: str) -> tuple[Optional[str], Optional[Iterator[pd.DataFrame]], List[Any]]:
+        """
+        Liest eine CSV-Datei als einzelnes "Tabellenblatt" mit der C-Engine von pd.read_csv
+        
+        Die Zeilen werden nicht auf einmal geladen, sondern blockweise
+        (CSV_CHUNK_ROWS Zeilen) geliefert, damit auch sehr große Dateien mit
+        begrenztem Speicher verarbeitet werden.
+        
+        Args:
+            csv_file: Pfad zur CSV-Datei oder Datei-Objekt
+            sheet_name: Name, unter dem die CSV-Datei als Tabellenblatt geführt wird
+            
+        Returns:
+            tuple: (sheet_name, Iterator über DataFrame-Blöcke, alle Spaltenüberschriften)
+                   oder (None, None, []) wenn die erwarteten Spalten fehlen
+        """
+        try:
+            columns = [col for col in pd.read_csv(csv_file, nrows=0, encoding='utf-8-sig', engine='c').columns
+                       if not str(col).startswith('Unnamed:')]
+            logger.info("🔍 Prüfe CSV-Datei: %s", sheet_name)
             
-            logger.error("❌ Kein Tabellenblatt mit der erwarteten Struktur gefunden")
-            return None, None
+            if not self._expected_set.issubset(columns):
+                missing_columns = [col for col in self.expected_columns if col not in columns]
+                logger.error("❌ CSV-Datei hat nicht die erwartete Struktur. Fehlende Spalten: %s", missing_columns)
+                logger.info("📋 Verfügbare Spalten in %s: %s", sheet_name, columns)
+                return None, None, []
+            
+            # Nur bekannte Spalten laden, direkt als String-Spalten
+            if hasattr(csv_file, 'seek'):
+                csv_file.seek(0)
+            usecols = [col for col in columns if col in self._known_set]
+            chunks = pd.read_csv(csv_file, usecols=usecols, dtype=STRING_DTYPE, encoding='utf-8-sig', engine='c',
+                                 chunksize=CSV_CHUNK_ROWS)
+            return sheet_name, chunks, columns
             
         except Exception as e:
-            logger.error(f"❌ Fehler beim Lesen der Excel-Datei: {str(e)}")
-            return None, None
+            logger.error("❌ Fehler beim Lesen der CSV-Datei: %s", e)
+            return None, None, []
     
-    def _validate_excel_structure(self, df: pd.DataFrame, filename: str, sheet_name: str) -> tuple[List[str], List[RAGProcessingWarning]]:
+    def _validate_excel_structure(self, columns: List[Any], filename: str, sheet_name: str) -> tuple[List[str], List[RAGProcessingWarning]]:
         """
-        Validiert die Excel-Struktur und gibt Fehler/Warnungen zurück
+        Validiert die Excel-Struktur (Spaltenüberschriften) und gibt Fehler/Warnungen zurück
         """
+        # Schneller Weg: genau die bekannten Spalten vorhanden -> nichts zu melden
+        if len(columns) == len(self._known_set) and self._known_set.issubset(columns):
+            return [], []
+        
         warnings = []
-        missing_columns = []
+        checked_ns = time.time_ns()
         
-        # Überprüfe erwartete Spalten
-        for expected_col in self.expected_columns:
-            if expected_col not in df.columns:
-                missing_columns.append(expected_col)
+        # Spaltenabgleich (pro Schema zwischengespeichert)
+        missing_columns, missing_optional, unknown_columns = _diff_columns(
+            tuple(columns), tuple(self.expected_columns), tuple(self.optional_columns)
+        )
+        missing_columns = list(missing_columns)
+        unknown_columns = list(unknown_columns)
         
         # Überprüfe optionale Spalten
-        for optional_col in self.optional_columns:
-            if optional_col not in df.columns:
-                warnings.append(RAGProcessingWarning(
-                    message=f"Optionale Spalte '{optional_col}' fehlt im Tabellenblatt '{sheet_name}'",
-                    warning_type="missing_optional_column",
-                    details={
-                        'column_name': optional_col,
-                        'filename': filename,
-                        'sheet_name': sheet_name,
-                        'available_columns': list(df.columns),
-                        'expected_columns': self.expected_columns,
-                        'optional_columns': self.optional_columns
-                    }
-                ))
+        for optional_col in missing_optional:
+            warnings.append(RAGProcessingWarning(
+                message=f"Optionale Spalte '{optional_col}' fehlt im Tabellenblatt '{sheet_name}'",
+                warning_type="missing_optional_column",
+                details={
+                    'column_name': optional_col,
+                    'filename': filename,
+                    'sheet_name': sheet_name,
+                    'available_columns': list(columns),
+                    'expected_columns': self.expected_columns,
+                    'optional_columns': self.optional_columns
+                },
+                timestamp_ns=checked_ns
+            ))
         
         # Überprüfe unbekannte Spalten
-        all_known_columns = self.expected_columns + self.optional_columns
-        unknown_columns = [col for col in df.columns if col not in all_known_columns]
-        
         if unknown_columns:
             warnings.append(RAGProcessingWarning(
                 message=f"Unbekannte Spalten gefunden in '{sheet_name}': {', '.join(unknown_columns)}",
@@ -183,71 +372,168 @@ class RAGIngestionAdapter:
                     'unknown_columns': unknown_columns,
                     'filename': filename,
                     'sheet_name': sheet_name,
-                    'available_columns': list(df.columns),
+                    'available_columns': list(columns),
                     'expected_columns': self.expected_columns,
                     'optional_columns': self.optional_columns,
                     'supported_format': "Excel-Datei mit Spalten: Nr., Frage, Antwort (Kommentar optional)"
-                }
+                },
+                timestamp_ns=checked_ns
             ))
         
         return missing_columns, warnings
     
     def _extract_qa_pairs_from_dataframe(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Extrahiert QA-Paare aus DataFrame"""
-        qa_pairs = []
+        # Bereinige Daten: spaltenweise strippen und in einem Schritt filtern
+        questions = df['Frage'].astype(STRING_DTYPE).str.strip()
+        answers = df['Antwort'].astype(STRING_DTYPE).str.strip()
+        mask = (questions.notna() & answers.notna() & questions.ne('') & answers.ne('')).fillna(False)
+        df = df.loc[mask]
         
-        # Bereinige Daten
-        df = df.dropna(subset=['Frage', 'Antwort'])
-        df = df[df['Frage'].str.strip() != '']
-        df = df[df['Antwort'].str.strip() != '']
-        
-        for index, row in df.iterrows():
-            try:
-                qa_pair = {
-                    'question': str(row.get('Frage', '')).strip(),
-                    'answer': str(row.get('Antwort', '')).strip(),
-                    'comment': str(row.get('Kommentar', '')).strip() if 'Kommentar' in row else None,
-                    'row_id': str(row.get('Nr.', f"row_{index}")).strip(),
-                    'index': index
-                }
-                
-                if qa_pair['question'] and qa_pair['answer']:
-                    qa_pairs.append(qa_pair)
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Fehler bei Zeile {index}: {str(e)}")
-                continue
+        # Fallback-ID für Zeilen ohne Nr.
+        row_ids = pd.Series([f"row_{index}" for index in df.index], index=df.index, dtype=STRING_DTYPE)
+        if 'Nr.' in df.columns:
+            row_ids = df['Nr.'].astype(STRING_DTYPE).str.strip().fillna(row_ids)
         
-        return qa_pairs
+        if 'Kommentar' in df.columns:
+            comments = df['Kommentar'].astype(STRING_DTYPE).str.strip()
+            comments = comments.astype(object).where(comments.notna(), None).tolist()
+        else:
+            comments = [None] * len(df)
+        
+        # QA-Dicts direkt aus den Spaltenlisten zusammensetzen (keine Zeilen-Iteration über pandas)
+        return [
+            {'question': question, 'answer': answer, 'comment': comment, 'row_id': row_id, 'index': index}
+            for question, answer, comment, row_id, index in zip(
+                questions[mask].tolist(), answers[mask].tolist(), comments, row_ids.tolist(), df.index.tolist()
+            )
+        ]
     
-    def _prepare_excel_content_for_ingestion(self, df: pd.DataFrame, qa_pairs: List[Dict[str, Any]], sheet_name: str) -> str:
+    def _prepare_excel_content_for_ingestion(self, qa_pairs: List[Dict[str, Any]], sheet_name: str) -> bytes:
         """
         Bereitet Excel-Inhalt für bestehenden Ingestion Service vor
-        Konvertiert QA-Paare in Text-Format
+        Konvertiert QA-Paare in Text-Format (direkt als UTF-8-Bytes)
         """
-        content_lines = []
-        
         # Header
-        content_lines.append(f"# FAQ-Daten aus Excel (Tabellenblatt: {sheet_name})")
-        content_lines.append("")
-        
-        # QA-Paare als strukturierten Text
-        for qa_pair in qa_pairs:
-            content_lines.append(f"## Frage {qa_pair['row_id']}")
-            content_lines.append("")
-            content_lines.append(f"**Frage:** {qa_pair['question']}")
-            content_lines.append("")
-            content_lines.append(f"**Antwort:** {qa_pair['answer']}")
+        buf = bytearray(b"# FAQ-Daten aus Excel (Tabellenblatt: ")
+        buf += sheet_name.encode('utf-8')
+        buf += b")\n"
+        
+        # QA-Paare als strukturierten Text; nur die variablen Felder werden kodiert
+        for qa in qa_pairs:
+            buf += _FRAGE_HEADER
+            buf += str(qa['row_id']).encode('utf-8')
+            buf += _FRAGE_LABEL
+            buf += str(qa['question']).encode('utf-8')
+            buf += _ANTWORT_LABEL
+            buf += str(qa['answer']).encode('utf-8')
+            if qa.get('comment'):
+                buf += _KOMMENTAR_LABEL
+                buf += str(qa['comment']).encode('utf-8')
+            buf += _BLOCK_END
+        
+        return bytes(buf)
+    
+    def _parse_excel_sync(self, raw_content: bytes, filename: str) -> ExcelParseResult:
+        """
+        Synchrone Excel-Verarbeitung (Blatt finden, validieren, QA-Paare extrahieren, Text aufbereiten)
+        
+        Blockierend (pandas/openpyxl) und daher für die Ausführung in einem Worker-Thread gedacht.
+        
+        Args:
+            raw_content: Roher Dateiinhalt
+            filename: Dateiname
             
-            if qa_pair.get('comment'):
-                content_lines.append("")
-                content_lines.append(f"**Kommentar:** {qa_pair['comment']}")
+        Returns:
+            ExcelParseResult: Zwischenergebnis für process_excel_upload
+        """
+        # Gültiges Tabellenblatt finden (direkt aus dem Speicher, ohne temporäre Datei)
+        if Path(filename).suffix.lower() == '.csv':
+            sheet_name, df, columns = self._find_valid_csv(io.BytesIO(raw_content), Path(filename).stem)
+        else:
+            sheet_name, df, columns = self._find_valid_sheet(io.BytesIO(raw_content))
+        
+        if sheet_name is None or df is None:
+            return ExcelParseResult()
+        
+        # Excel-Struktur validieren
+        missing_columns, warnings = self._validate_excel_structure(columns, filename, sheet_name)
+        
+        if missing_columns:
+            return ExcelParseResult(
+                sheet_name=sheet_name,
+                total_rows=len(df) if isinstance(df, pd.DataFrame) else sum(len(frame) for frame in df),
+                available_columns=list(columns),
+                missing_columns=missing_columns,
+                warnings=warnings
+            )
+        
+        # QA-Paare extrahieren (CSV-Dateien blockweise, Excel-Blätter in einem Schritt)
+        total_rows = 0
+        qa_pairs = []
+        for frame in ([df] if isinstance(df, pd.DataFrame) else df):
+            total_rows += len(frame)
+            qa_pairs.extend(self._extract_qa_pairs_from_dataframe(frame))
+        
+        # Excel-Inhalt für bestehenden Service vorbereiten (entfällt bei strukturierter Übergabe
+        # und wenn keine gültigen QA-Paare gefunden wurden)
+        prepared_content = None
+        if qa_pairs and self._structured_ingest is None:
+            prepared_content = self._prepare_excel_content_for_ingestion(qa_pairs, sheet_name)
+        
+        return ExcelParseResult(
+            sheet_name=sheet_name,
+            total_rows=total_rows,
+            available_columns=list(columns),
+            warnings=warnings,
+            qa_pairs=qa_pairs,
+            prepared_content=prepared_content
+        )
+    
+    def _get_parse_cache_key(self, raw_content: bytes, filename: str) -> str:
+        """Erzeugt den Cache-Schlüssel aus Dateiinhalt und Dateiname"""
+        content_hash = hashlib.blake2b(raw_content, digest_size=16).hexdigest()
+        return f"{content_hash}:{filename}"
+    
+    async def _parse_excel_cached(self, raw_content: bytes, filename: str) -> ExcelParseResult:
+        """
+        Liefert das Parse-Ergebnis aus dem Cache oder parst die Datei im Worker-Thread
+        
+        Der Aufrufer erhält immer eine eigene Kopie (QA-Dicts, Warnungen samt Details),
+        die Warnungen tragen den Zeitpunkt dieser Anfrage.
+        """
+        request_ns = time.time_ns()
+        cache_key = self._get_parse_cache_key(raw_content, filename)
+        
+        cached_result = self._parse_cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("♻️ Parse-Ergebnis aus Cache verwendet: %s", filename)
+            self._parse_cache.move_to_end(cache_key)
+        else:
+            # Blockierende Excel-Verarbeitung im Worker-Thread, damit der Event-Loop frei bleibt
+            cached_result = await asyncio.to_thread(self._parse_excel_sync, raw_content, filename)
             
-            content_lines.append("")
-            content_lines.append("---")
-            content_lines.append("")
+            if self.parse_cache_size > 0:
+                self._parse_cache[cache_key] = cached_result
+                while len(self._parse_cache) > self.parse_cache_size:
+                    self._parse_cache.popitem(last=False)
         
-        return "\n".join(content_lines)
+        # Kopie, damit Aufrufer den Cache-Eintrag nicht verändern (QA-Dicts enthalten nur Skalare)
+        return replace(
+            cached_result,
+            available_columns=list(cached_result.available_columns),
+            missing_columns=list(cached_result.missing_columns),
+            warnings=[
+                RAGProcessingWarning(
+                    message=warning.message,
+                    warning_type=warning.warning_type,
+                    details=copy.deepcopy(warning.details),
+                    timestamp_ns=request_ns
+                )
+                for warning in cached_result.warnings
+            ],
+            qa_pairs=[dict(qa_pair) for qa_pair in cached_result.qa_pairs]
+        )
     
     async def async_ingest(self, 
                           filename: str,
@@ -264,12 +550,12 @@ class RAGIngestionAdapter:
         """
         try:
             # Dateityp-Erkennung
-            file_extension = Path(filename).suffix.upper()
+            file_extension = Path(filename).suffix.lower()
             
             # Proxy-Logik: Entscheide basierend auf Dateityp
-            if file_extension in ['.XLSX', '.XLS', '.XLSM', '.XLSB', '.CSV']:
+            if file_extension in TABULAR_EXTENSIONS:
                 # RAG-Verarbeitung für Tabellen
-                logger.info(f"🔍 RAG-Verarbeitung für Tabellen-Datei: {filename}")
+                logger.info("🔍 RAG-Verarbeitung für Tabellen-Datei: %s", filename)
                 return await self.process_excel_upload(
                     filename=filename,
                     raw_content=raw_content,
@@ -282,7 +568,7 @@ class RAGIngestionAdapter:
                 )
             else:
                 # Weiterleitung an Original Service
-                logger.info(f"📄 Original Service für: {filename}")
+                logger.info("📄 Original Service für: %s", filename)
                 return await self.original_service.async_ingest(
                     filename=filename,
                     raw_content=raw_content,
@@ -295,9 +581,54 @@ class RAGIngestionAdapter:
                 )
                 
         except Exception as e:
-            logger.error(f"❌ Fehler in Proxy-Methode async_ingest: {str(e)}")
+            logger.error("❌ Fehler in Proxy-Methode async_ingest: %s", e)
             raise
     
+    async def async_ingest_many(self,
+                                items: List[UploadItem],
+                                max_concurrency: int = 8) -> List[Union[ExtendedDocumentMetadata, Exception]]:
+        """
+        Verarbeitet mehrere Uploads nebenläufig
+        
+        Das Excel-Parsing läuft pro Datei im Worker-Thread, die Delegation an den
+        Original Service erfolgt überlappend statt streng nacheinander. Ein
+        fehlgeschlagener Upload bricht die übrigen nicht ab.
+        
+        Args:
+            items: Liste der Uploads
+            max_concurrency: Maximale Anzahl gleichzeitig verarbeiteter Uploads (>= 1)
+            
+        Returns:
+            List[Union[ExtendedDocumentMetadata, Exception]]: Pro Upload in der Reihenfolge
+            von items die Metadaten oder die aufgetretene Exception
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency muss >= 1 sein: {max_concurrency}")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def ingest_item(item: UploadItem):
+            async with semaphore:
+                return await self.async_ingest(
+                    filename=item.filename,
+                    raw_content=item.raw_content,
+                    documentId=item.document_id,
+                    documentSource=item.document_source,
+                    documentClass=item.document_class,
+                    documentMimeType=item.document_mime_type,
+                    documentInternal=item.document_internal,
+                    desc=item.description
+                )
+        
+        logger.info("📦 Batch-Ingestion für %d Dateien", len(items))
+        results = await asyncio.gather(*(ingest_item(item) for item in items), return_exceptions=True)
+        
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error("❌ Batch-Ingestion fehlgeschlagen für %s: %s", item.filename, result)
+        
+        return list(results)
+    
     async def process_excel_upload(self, 
                                  filename: str,
                                  raw_content: bytes,
@@ -313,20 +644,34 @@ class RAGIngestionAdapter:
         processing_errors = []
         processing_warnings = []
         
+        # Ein Zeitstempel pro Upload für Metadaten und Fehlereinträge
+        created_at = datetime.now()
+        
+        # Gemeinsame Felder aller Metadaten-Varianten
+        base_metadata = {
+            'document_id': document_id,
+            'document_source': document_source,
+            'document_class': document_class,
+            'document_mime_type': document_mime_type or "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            'document_internal': document_internal,
+            'description': description,
+            'filename': filename,
+            'file_size': len(raw_content),
+            'created_at': created_at,
+            'processing_errors': processing_errors,
+            'processing_warnings': processing_warnings
+        }
+        
         try:
-            logger.info(f"📖 Verarbeite Excel-Upload: {filename}")
-            
-            # Temporäre Datei erstellen
-            temp_file = Path(f"/tmp/{filename}")
-            with open(temp_file, 'wb') as f:
-                f.write(raw_content)
+            logger.info("📖 Verarbeite Excel-Upload: %s", filename)
             
-            # Gültiges Tabellenblatt finden
-            sheet_name, df = self._find_valid_sheet(temp_file)
+            # Excel parsen (bei identischem Inhalt aus dem Cache)
+            parse_result = await self._parse_excel_cached(raw_content, filename)
+            sheet_name = parse_result.sheet_name
             
-            if sheet_name is None or df is None:
+            if sheet_name is None:
                 error_msg = "Kein Tabellenblatt mit der erwarteten Struktur gefunden"
-                logger.error(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 processing_errors.append({
                     'message': error_msg,
                     'error_type': 'no_valid_sheet',
@@ -335,37 +680,20 @@ class RAGIngestionAdapter:
                         'expected_sheets': self.expected_sheets,
                         'supported_format': "Excel-Datei mit Spalten: Nr., Frage, Antwort (Kommentar optional)"
                     },
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': created_at.isoformat()
                 })
                 
                 # Erstelle Metadaten mit Fehlerinformationen
-                metadata = ExtendedDocumentMetadata(
-                    document_id=document_id,
-                    document_source=document_source,
-                    document_class=document_class,
-                    document_mime_type=document_mime_type or "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    document_internal=document_internal,
-                    description=description,
-                    filename=filename,
-                    file_size=len(raw_content),
-                    created_at=datetime.now(),
-                    processing_errors=processing_errors,
-                    processing_warnings=processing_warnings
-                )
-                
-                # Temporäre Datei löschen
-                temp_file.unlink()
-                
-                return metadata
+                return ExtendedDocumentMetadata(**base_metadata)
             
-            # Excel-Struktur validieren
-            missing_columns, warnings = self._validate_excel_structure(df, filename, sheet_name)
-            processing_warnings.extend([w.to_dict() for w in warnings])
+            # Ergebnis der Strukturvalidierung übernehmen
+            missing_columns = parse_result.missing_columns
+            processing_warnings.extend([w.to_dict() for w in parse_result.warnings])
             
             # Fehler bei fehlenden Pflichtspalten
             if missing_columns:
                 error_msg = f"Pflichtspalten fehlen im Tabellenblatt '{sheet_name}': {', '.join(missing_columns)}"
-                logger.error(f"❌ {error_msg}")
+                logger.error("❌ %s", error_msg)
                 processing_errors.append({
                     'message': error_msg,
                     'error_type': 'missing_required_columns',
@@ -373,97 +701,87 @@ class RAGIngestionAdapter:
                         'missing_columns': missing_columns,
                         'filename': filename,
                         'sheet_name': sheet_name,
-                        'available_columns': list(df.columns),
+                        'available_columns': parse_result.available_columns,
                         'expected_columns': self.expected_columns,
                         'optional_columns': self.optional_columns,
                         'supported_format': "Excel-Datei mit Spalten: Nr., Frage, Antwort (Kommentar optional)"
                     },
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': created_at.isoformat()
                 })
                 
                 # Erstelle trotzdem Metadaten mit Fehlerinformationen
-                metadata = ExtendedDocumentMetadata(
-                    document_id=document_id,
-                    document_source=document_source,
-                    document_class=document_class,
-                    document_mime_type=document_mime_type or "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    document_internal=document_internal,
-                    description=description,
-                    filename=filename,
-                    file_size=len(raw_content),
-                    created_at=datetime.now(),
-                    total_rows=len(df),
-                    total_columns=len(df.columns),
-                    qa_pairs=[],
-                    processing_errors=processing_errors,
-                    processing_warnings=processing_warnings
+                return ExtendedDocumentMetadata(
+                    **base_metadata,
+                    total_rows=parse_result.total_rows,
+                    total_columns=len(parse_result.available_columns),
+                    qa_pairs=[]
                 )
-                
-                # Temporäre Datei löschen
-                temp_file.unlink()
-                
-                return metadata
             
-            # QA-Paare extrahieren
-            qa_pairs = self._extract_qa_pairs_from_dataframe(df)
+            qa_pairs = parse_result.qa_pairs
+            prepared_content = parse_result.prepared_content
             
-            # Excel-Inhalt für bestehenden Service vorbereiten
-            prepared_content = self._prepare_excel_content_for_ingestion(df, qa_pairs, sheet_name)
-            
-            # Temporäre Datei löschen
-            temp_file.unlink()
+            # Ohne gültige QA-Paare gibt es nichts zu delegieren
+            if not qa_pairs:
+                logger.warning("⚠️ Keine gültigen QA-Paare im Tabellenblatt '%s' gefunden", sheet_name)
+                processing_warnings.append(RAGProcessingWarning(
+                    message=f"Keine gültigen QA-Paare im Tabellenblatt '{sheet_name}' gefunden",
+                    warning_type="no_valid_qa_pairs",
+                    details={
+                        'filename': filename,
+                        'sheet_name': sheet_name,
+                        'total_rows': parse_result.total_rows
+                    }
+                ).to_dict())
+                
+                return ExtendedDocumentMetadata(
+                    **base_metadata,
+                    total_rows=parse_result.total_rows,
+                    total_columns=len(parse_result.available_columns),
+                    qa_pairs=[]
+                )
             
             # AN BESTEHENDEN SERVICE DELEGIEREN!
             # Der bestehende Service macht alles: Metadaten, Hash, Extraction, etc.
-            logger.info(f"🔄 Delegiere an bestehenden FAQIngestionService (Tabellenblatt: {sheet_name})")
-            
-            # Erstelle temporäre Datei mit vorbereitetem Inhalt
-            temp_content_file = Path(f"/tmp/{filename}_{sheet_name}.txt")
-            with open(temp_content_file, 'w', encoding='utf-8') as f:
-                f.write(prepared_content)
-            
-            # Lese vorbereiteten Inhalt
-            with open(temp_content_file, 'rb') as f:
-                prepared_raw_content = f.read()
+            logger.info("🔄 Delegiere an bestehenden FAQIngestionService (Tabellenblatt: %s)", sheet_name)
             
             # Delegiere an bestehenden Service
-            metadata = await self.original_service.async_ingest(
-                filename=f"{filename}_{sheet_name}.txt",  # Ändere Extension zu .txt
-                raw_content=prepared_raw_content,
-                documentId=document_id,
-                documentSource=document_source,
-                documentClass=document_class,
-                documentMimeType="text/plain",  # Ändere zu text/plain
-                documentInternal=document_internal,
-                desc=description
-            )
-            
-            # Temporäre Datei löschen
-            temp_content_file.unlink()
+            if self._structured_ingest is not None:
+                # QA-Paare direkt übergeben, ohne Markdown-Serialisierung
+                metadata = await self._structured_ingest(
+                    filename=filename,
+                    qa_pairs=qa_pairs,
+                    sheet_name=sheet_name,
+                    documentId=document_id,
+                    documentSource=document_source,
+                    documentClass=document_class,
+                    documentInternal=document_internal,
+                    desc=description
+                )
+            else:
+                metadata = await self.original_service.async_ingest(
+                    filename=f"{filename}_{sheet_name}.txt",  # Ändere Extension zu .txt
+                    raw_content=prepared_content,
+                    documentId=document_id,
+                    documentSource=document_source,
+                    documentClass=document_class,
+                    documentMimeType="text/plain",  # Ändere zu text/plain
+                    documentInternal=document_internal,
+                    desc=description
+                )
             
             # Erweitere Metadaten um RAG-spezifische Informationen
             extended_metadata = ExtendedDocumentMetadata(
-                document_id=document_id,
-                document_source=document_source,
-                document_class=document_class,
-                document_mime_type=document_mime_type or "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                document_internal=document_internal,
-                description=description,
-                filename=filename,
-                file_size=len(raw_content),
-                created_at=datetime.now(),
-                total_rows=len(df),
-                total_columns=len(df.columns),
-                qa_pairs=qa_pairs,
-                processing_errors=processing_errors,
-                processing_warnings=processing_warnings
+                **base_metadata,
+                total_rows=parse_result.total_rows,
+                total_columns=len(parse_result.available_columns),
+                qa_pairs=qa_pairs
             )
             
-            logger.info(f"✅ Excel-Upload erfolgreich verarbeitet: {len(qa_pairs)} QA-Paare aus Tabellenblatt '{sheet_name}'")
+            logger.info("✅ Excel-Upload erfolgreich verarbeitet: %d QA-Paare aus Tabellenblatt '%s'", len(qa_pairs), sheet_name)
             return extended_metadata
             
         except Exception as e:
-            logger.error(f"❌ Fehler beim Verarbeiten des Excel-Uploads: {str(e)}")
+            logger.error("❌ Fehler beim Verarbeiten des Excel-Uploads: %s", e)
             processing_errors.append({
                 'message': f"Unerwarteter Fehler: {str(e)}",
                 'error_type': 'unexpected_error',
@@ -471,25 +789,13 @@ class RAGIngestionAdapter:
                     'filename': filename,
                     'error': str(e)
                 },
-                'timestamp': datetime.now().isoformat()
+                'timestamp': created_at.isoformat()
             })
             
-            # Erstelle Metadaten mit Fehlerinformationen
-            metadata = ExtendedDocumentMetadata(
-                document_id=document_id,
-                document_source=document_source,
-                document_class=document_class,
-                document_mime_type=document_mime_type,
-                document_internal=document_internal,
-                description=description,
-                filename=filename,
-                file_size=len(raw_content),
-                created_at=datetime.now(),
-                processing_errors=processing_errors,
-                processing_warnings=processing_warnings
+            # Erstelle Metadaten mit Fehlerinformationen (MIME-Type unverändert übernehmen)
+            return ExtendedDocumentMetadata(
+                **{**base_metadata, 'document_mime_type': document_mime_type}
             )
-            
-            return metadata
 
 # Vereinfachte Factory-Funktion
 def create_rag_adapter(original_service) -> RAGIngestionAdapter:
@@ -4,12 +4,16 @@
 TableChunkingService - Spezialisiert für Tabellen-Chunking
 """
 
+import re
 import logging
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Beginn eines QA-Blocks (Zeile "## Frage ...")
+_QUESTION_HEADER = re.compile(r'^## Frage', re.MULTILINE)
+
 @dataclass
 class TableChunk:
     """Ein Chunk für Tabellen-Daten"""
@@ -36,80 +40,84 @@ class TableChunkingService:
         self.overlap = overlap
         logger.info("✅ TableChunkingService initialisiert")
     
+    def _create_chunk(self, chunk_id: int, chunk_content: str, chunk_qa_pairs: List[Dict[str, Any]],
+                      overlap_qa_pairs: int = 0) -> TableChunk:
+        """
+        Erstellt einen Chunk mit Standard-Metadaten
+        
+        overlap_qa_pairs: Anzahl der ersten QA-Paare, die als Overlap aus dem
+        vorherigen Chunk übernommen wurden (in qa_pairs enthalten)
+        """
+        return TableChunk(
+            content=chunk_content,
+            metadata={
+                'chunk_type': 'table_qa',
+                'qa_pairs_count': len(chunk_qa_pairs),
+                'overlap_qa_pairs': overlap_qa_pairs,
+                'chunk_size': len(chunk_content),
+                'chunk_id': f"table_chunk_{chunk_id}"
+            },
+            chunk_id=f"table_chunk_{chunk_id}",
+            qa_pairs=chunk_qa_pairs
+        )
+    
     def _split_content_into_chunks(self, content: str, qa_pairs: List[Dict[str, Any]]) -> List[TableChunk]:
         """
         Teilt Inhalt in Chunks auf, behält QA-Paare als Einheiten
+        
+        Arbeitet in einem Durchlauf über die Offsets der Fragen-Überschriften:
+        Chunk-Grenzen liegen immer vor einer Zeile "## Frage", der Chunk-Inhalt
+        ist ein Slice des Originaltexts (kein Zerlegen in Zeilen). Bei overlap > 0
+        beginnt ein neuer Chunk mit den letzten vollständigen QA-Blöcken des
+        vorherigen Chunks, die zusammen höchstens overlap Zeichen lang sind; deren
+        QA-Paare stehen auch in qa_pairs (Anzahl in metadata['overlap_qa_pairs']).
         """
         chunks = []
-        current_chunk_content = []
-        current_chunk_qa_pairs = []
-        current_size = 0
-        chunk_id = 0
+        chunk_start = 0          # Offset des aktuellen Chunks im Inhalt
+        chunk_qa_start = 0       # Index des ersten QA-Paars im aktuellen Chunk
+        chunk_first_question = 0 # Index der ersten Fragen-Überschrift im aktuellen Chunk
+        chunk_overlap = 0        # Anzahl der als Overlap übernommenen QA-Paare
+        question_count = 0       # Anzahl bisher gesehener Fragen-Überschriften
+        header_starts = []       # Offsets aller bisherigen Fragen-Überschriften
         
-        # Teile Inhalt in Zeilen
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            line_size = len(line) + 1  # +1 für Zeilenumbruch
+        for match in _QUESTION_HEADER.finditer(content):
+            header_start = match.start()
+            header_end = content.find('\n', header_start)
+            header_size = (header_end if header_end != -1 else len(content)) - header_start + 1  # +1 für Zeilenumbruch
             
             # Wenn neue Frage beginnt und Chunk würde zu groß
-            if (line.startswith('## Frage') and 
-                current_size + line_size > self.max_chunk_size and 
-                current_chunk_content):
+            if (header_start > chunk_start and
+                    header_start - chunk_start + header_size > self.max_chunk_size):
                 
-                # Erstelle aktuellen Chunk
-                chunk_content = '\n'.join(current_chunk_content)
-                chunk = TableChunk(
-                    content=chunk_content,
-                    metadata={
-                        'chunk_type': 'table_qa',
-                        'qa_pairs_count': len(current_chunk_qa_pairs),
-                        'chunk_size': len(chunk_content),
-                        'chunk_id': f"table_chunk_{chunk_id}"
-                    },
-                    chunk_id=f"table_chunk_{chunk_id}",
-                    qa_pairs=current_chunk_qa_pairs.copy()
-                )
-                chunks.append(chunk)
+                # Erstelle aktuellen Chunk (ohne den Zeilenumbruch vor der Überschrift)
+                chunk_end = header_start - 1
+                qa_end = min(question_count, len(qa_pairs))
+                chunks.append(self._create_chunk(
+                    len(chunks), content[chunk_start:chunk_end], qa_pairs[chunk_qa_start:qa_end], chunk_overlap
+                ))
                 
-                # Starte neuen Chunk
-                chunk_id += 1
-                current_chunk_content = []
-                current_chunk_qa_pairs = []
-                current_size = 0
+                # Overlap: letzte vollständige QA-Blöcke (nie der erste Block des Chunks),
+                # solange sie zusammen in overlap Zeichen passen
+                first_carried = question_count
+                while (first_carried - 1 > chunk_first_question and
+                       chunk_end - header_starts[first_carried - 1] <= self.overlap):
+                    first_carried -= 1
                 
-                # Füge Overlap hinzu (letzte Zeilen des vorherigen Chunks)
-                if self.overlap > 0 and chunks:
-                    overlap_lines = current_chunk_content[-3:]  # Letzte 3 Zeilen
-                    current_chunk_content.extend(overlap_lines)
-                    current_size = sum(len(line) + 1 for line in overlap_lines)
-            
-            # Füge Zeile zum aktuellen Chunk hinzu
-            current_chunk_content.append(line)
-            current_size += line_size
+                # Starte neuen Chunk
+                chunk_start = header_starts[first_carried] if first_carried < question_count else header_start
+                chunk_qa_start = min(first_carried, qa_end)
+                chunk_overlap = qa_end - chunk_qa_start
+                chunk_first_question = first_carried
             
-            # Wenn neue Frage beginnt, markiere QA-Paar
-            if line.startswith('## Frage'):
-                # Finde das entsprechende QA-Paar
-                qa_index = len(current_chunk_qa_pairs)
-                if qa_index < len(qa_pairs):
-                    current_chunk_qa_pairs.append(qa_pairs[qa_index])
+            header_starts.append(header_start)
+            question_count += 1
         
         # Erstelle letzten Chunk
-        if current_chunk_content:
-            chunk_content = '\n'.join(current_chunk_content)
-            chunk = TableChunk(
-                content=chunk_content,
-                metadata={
-                    'chunk_type': 'table_qa',
-                    'qa_pairs_count': len(current_chunk_qa_pairs),
-                    'chunk_size': len(chunk_content),
-                    'chunk_id': f"table_chunk_{chunk_id}"
-                },
-                chunk_id=f"table_chunk_{chunk_id}",
-                qa_pairs=current_chunk_qa_pairs.copy()
-            )
-            chunks.append(chunk)
+        if content or not chunks:
+            qa_end = min(question_count, len(qa_pairs))
+            chunks.append(self._create_chunk(
+                len(chunks), content[chunk_start:], qa_pairs[chunk_qa_start:qa_end], chunk_overlap
+            ))
         
         return chunks
     
@@ -4,14 +4,22 @@
 TableExtractionService - Spezialisiert für Excel/Tabellen-Extraktion
 """
 
+import io
 import logging
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, BinaryIO
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Excel-Engine für pandas: python-calamine (Rust-basiert), sonst pandas-Standard
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None
+
 @dataclass
 class TableExtractionResult:
     """Ergebnis der Tabellen-Extraktion"""
@@ -29,7 +37,14 @@ class TableExtractionService:
     Spezialisierter Service für Excel/Tabellen-Extraktion
     """
     
-    def __init__(self):
+    def __init__(self, engine: Optional[str] = EXCEL_ENGINE):
+        """
+        Args:
+            engine: Excel-Engine für pandas (Standard: 'calamine' falls installiert,
+                    sonst pandas-Standard, d.h. openpyxl für .xlsx und xlrd für .xls)
+        """
+        self.engine = engine
+        
         # Erwartete Spalten für QA-Struktur
         self.expected_columns = ['Nr.', 'Frage', 'Antwort']
         self.optional_columns = ['Kommentar']
@@ -39,51 +54,42 @@ class TableExtractionService:
         
         logger.info("✅ TableExtractionService initialisiert")
     
-    def _find_valid_sheet(self, excel_file: Path) -> tuple[Optional[str], Optional[pd.DataFrame]]:
+    def _find_valid_sheet(self, excel_file: Union[Path, BinaryIO]) -> tuple[Optional[str], Optional[pd.DataFrame]]:
         """
         Findet das erste Tabellenblatt mit der richtigen Struktur
+        
+        Die Arbeitsmappe wird einmal geöffnet; für die Prüfung wird pro Blatt nur
+        die Kopfzeile gelesen (erst die erwarteten Blätter, danach alle übrigen),
+        vollständig gelesen wird nur das gefundene Blatt.
         """
         try:
-            # Alle Tabellenblätter lesen
-            excel_file_obj = pd.ExcelFile(excel_file)
-            available_sheets = excel_file_obj.sheet_names
-            
-            logger.info(f"📋 Verfügbare Tabellenblätter: {available_sheets}")
-            
-            # Suche nach dem ersten Blatt mit der richtigen Struktur
-            for sheet_name in self.expected_sheets:
-                if sheet_name in available_sheets:
+            # Arbeitsmappe einmal öffnen
+            with pd.ExcelFile(excel_file, engine=self.engine) as excel_file_obj:
+                available_sheets = excel_file_obj.sheet_names
+                
+                logger.info(f"📋 Verfügbare Tabellenblätter: {available_sheets}")
+                
+                # Erwartete Blätter (nach Priorität) zuerst, danach alle übrigen
+                ordered_sheets = ([sheet for sheet in self.expected_sheets if sheet in available_sheets] +
+                                  [sheet for sheet in available_sheets if sheet not in self.expected_sheets])
+                
+                for sheet_name in ordered_sheets:
                     logger.info(f"🔍 Prüfe Tabellenblatt: {sheet_name}")
                     
-                    # Blatt lesen
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                    # Nur die Kopfzeile lesen
+                    header = excel_file_obj.parse(sheet_name=sheet_name, nrows=0)
                     
                     # Prüfe ob die erwarteten Spalten vorhanden sind
-                    missing_columns = [col for col in self.expected_columns if col not in df.columns]
+                    missing_columns = [col for col in self.expected_columns if col not in header.columns]
                     
                     if not missing_columns:
                         logger.info(f"✅ Gültiges Tabellenblatt gefunden: {sheet_name}")
-                        return sheet_name, df
-                    else:
+                        # Daten nur für das gefundene Blatt vollständig lesen
+                        return sheet_name, excel_file_obj.parse(sheet_name=sheet_name)
+                    
+                    if sheet_name in self.expected_sheets:
                         logger.warning(f"⚠️ Tabellenblatt {sheet_name} hat nicht die erwartete Struktur. Fehlende Spalten: {missing_columns}")
-                        logger.info(f"📋 Verfügbare Spalten in {sheet_name}: {list(df.columns)}")
-            
-            # Wenn kein erwartetes Blatt gefunden, suche in allen Blättern
-            logger.info("🔍 Suche in allen verfügbaren Tabellenblättern...")
-            for sheet_name in available_sheets:
-                logger.info(f"🔍 Prüfe Tabellenblatt: {sheet_name}")
-                
-                # Blatt lesen
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                
-                # Prüfe ob die erwarteten Spalten vorhanden sind
-                missing_columns = [col for col in self.expected_columns if col not in df.columns]
-                
-                if not missing_columns:
-                    logger.info(f"✅ Gültiges Tabellenblatt gefunden: {sheet_name}")
-                    return sheet_name, df
-                else:
-                    logger.info(f"📋 Verfügbare Spalten in {sheet_name}: {list(df.columns)}")
+                    logger.info(f"📋 Verfügbare Spalten in {sheet_name}: {list(header.columns)}")
             
             logger.error("❌ Kein Tabellenblatt mit der erwarteten Struktur gefunden")
             return None, None
@@ -143,60 +149,47 @@ class TableExtractionService:
     
     def _extract_qa_pairs_from_dataframe(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Extrahiert QA-Paare aus DataFrame"""
-        qa_pairs = []
+        # Bereinige Daten: spaltenweise strippen und in einem Schritt filtern
+        questions = df['Frage'].astype('string').str.strip()
+        answers = df['Antwort'].astype('string').str.strip()
+        mask = (questions.notna() & answers.notna() & questions.ne('') & answers.ne('')).fillna(False)
+        df = df.loc[mask]
         
-        # Bereinige Daten
-        df = df.dropna(subset=['Frage', 'Antwort'])
-        df = df[df['Frage'].str.strip() != '']
-        df = df[df['Antwort'].str.strip() != '']
+        # Fallback-ID für Zeilen ohne Nr.
+        row_ids = pd.Series([f"row_{index}" for index in df.index], index=df.index, dtype='string')
+        if 'Nr.' in df.columns:
+            row_ids = df['Nr.'].astype('string').str.strip().fillna(row_ids)
         
-        for index, row in df.iterrows():
-            try:
-                qa_pair = {
-                    'question': str(row.get('Frage', '')).strip(),
-                    'answer': str(row.get('Antwort', '')).strip(),
-                    'comment': str(row.get('Kommentar', '')).strip() if 'Kommentar' in row else None,
-                    'row_id': str(row.get('Nr.', f"row_{index}")).strip(),
-                    'index': index
-                }
-                
-                if qa_pair['question'] and qa_pair['answer']:
-                    qa_pairs.append(qa_pair)
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Fehler bei Zeile {index}: {str(e)}")
-                continue
+        if 'Kommentar' in df.columns:
+            comments = df['Kommentar'].astype('string').str.strip()
+            comments = comments.astype(object).where(comments.notna(), None).tolist()
+        else:
+            comments = [None] * len(df)
         
-        return qa_pairs
+        # QA-Dicts direkt aus den Spaltenlisten zusammensetzen (keine Zeilen-Iteration über pandas)
+        return [
+            {'question': question, 'answer': answer, 'comment': comment, 'row_id': row_id, 'index': index}
+            for question, answer, comment, row_id, index in zip(
+                questions[mask].tolist(), answers[mask].tolist(), comments, row_ids.tolist(), df.index.tolist()
+            )
+        ]
     
     def _prepare_content_for_chunking(self, df: pd.DataFrame, qa_pairs: List[Dict[str, Any]], sheet_name: str) -> str:
         """
         Bereitet Inhalt für Chunking vor
         Konvertiert QA-Paare in strukturierten Text
         """
-        content_lines = []
-        
-        # Header
-        content_lines.append(f"# FAQ-Daten aus Excel (Tabellenblatt: {sheet_name})")
-        content_lines.append("")
+        # Ein Textblock pro QA-Paar, alles in einem einzigen join zusammengesetzt
+        blocks = [
+            f"## Frage {qa_pair['row_id']}\n\n"
+            f"**Frage:** {qa_pair['question']}\n\n"
+            f"**Antwort:** {qa_pair['answer']}"
+            + (f"\n\n**Kommentar:** {qa_pair['comment']}" if qa_pair.get('comment') else "")
+            + "\n\n---\n"
+            for qa_pair in qa_pairs
+        ]
         
-        # QA-Paare als strukturierten Text
-        for qa_pair in qa_pairs:
-            content_lines.append(f"## Frage {qa_pair['row_id']}")
-            content_lines.append("")
-            content_lines.append(f"**Frage:** {qa_pair['question']}")
-            content_lines.append("")
-            content_lines.append(f"**Antwort:** {qa_pair['answer']}")
-            
-            if qa_pair.get('comment'):
-                content_lines.append("")
-                content_lines.append(f"**Kommentar:** {qa_pair['comment']}")
-            
-            content_lines.append("")
-            content_lines.append("---")
-            content_lines.append("")
-        
-        return "\n".join(content_lines)
+        return "\n".join([f"# FAQ-Daten aus Excel (Tabellenblatt: {sheet_name})", "", *blocks])
     
     async def extract(self, 
                      filename: str,
@@ -219,13 +212,8 @@ class TableExtractionService:
         try:
             logger.info(f"📖 Extrahiere Inhalt aus Excel: {filename}")
             
-            # Temporäre Datei erstellen
-            temp_file = Path(f"/tmp/{filename}")
-            with open(temp_file, 'wb') as f:
-                f.write(raw_content)
-            
-            # Gültiges Tabellenblatt finden
-            sheet_name, df = self._find_valid_sheet(temp_file)
+            # Gültiges Tabellenblatt finden (direkt aus dem Speicher, ohne temporäre Datei)
+            sheet_name, df = self._find_valid_sheet(io.BytesIO(raw_content))
             
             if sheet_name is None or df is None:
                 error_msg = "Kein Tabellenblatt mit der erwarteten Struktur gefunden"
@@ -240,9 +228,6 @@ class TableExtractionService:
                     }
                 })
                 
-                # Temporäre Datei löschen
-                temp_file.unlink()
-                
                 return TableExtractionResult(
                     content="",
                     metadata={},
@@ -276,9 +261,6 @@ class TableExtractionService:
                     }
                 })
                 
-                # Temporäre Datei löschen
-                temp_file.unlink()
-                
                 return TableExtractionResult(
                     content="",
                     metadata={},
@@ -311,9 +293,6 @@ class TableExtractionService:
                 'processing_warnings': processing_warnings
             }
             
-            # Temporäre Datei löschen
-            temp_file.unlink()
-            
             logger.info(f"✅ Excel-Extraktion erfolgreich: {len(qa_pairs)} QA-Paare aus Tabellenblatt '{sheet_name}'")
             
             return TableExtractionResult(
@@ -4,19 +4,35 @@
 TableFAQIngestionService - Spezialisierte Pipeline für Excel/Tabellen
 """
 
+import asyncio
+import copy
 import logging
 import hashlib
+import random
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, MutableMapping, Union, BinaryIO, Callable, Awaitable
 from dataclasses import dataclass
 
 # Import der spezialisierten Services
 from .table_extraction_service import TableExtractionService, TableExtractionResult
-from .table_chunking_service import TableChunkingService, TableChunkingResult, TableChunk
+from .table_chunking_service import TableChunkingService, TableChunk
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Blockgröße für das inkrementelle Hashen von Dokumenten
+HASH_BLOCK_SIZE = 1 << 20
+
+# Backoff für Embedding-Aufrufe bei Rate-Limits (Sekunden)
+EMBEDDING_RETRY_BASE_DELAY = 1.0
+EMBEDDING_RETRY_MAX_DELAY = 32.0
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Erkennt Rate-Limit-Fehler (HTTP 429) des Embedding-Services, z.B. openai.RateLimitError"""
+    return type(error).__name__ == 'RateLimitError' or getattr(error, 'status_code', None) == 429
+
+@dataclass(slots=True)
 class TableDocumentMetadata:
     """Metadaten für Tabellen-Dokumente"""
     document_id: str
@@ -27,6 +43,7 @@ class TableDocumentMetadata:
     description: Optional[str] = None
     filename: Optional[str] = None
     file_size: Optional[int] = None
+    document_hash: Optional[str] = None
     created_at: Optional[datetime] = None
     
     # Tabellen-spezifische Metadaten
@@ -39,6 +56,9 @@ class TableDocumentMetadata:
     # Fehlerbehandlung
     processing_errors: Optional[list] = None
     processing_warnings: Optional[list] = None
+    
+    # Informationen zur Vektor-Speicherung (nach erfolgreicher Ingestion)
+    vector_storage_info: Optional[Dict[str, Any]] = None
 
 class TableFAQIngestionService:
     """
@@ -49,7 +69,18 @@ class TableFAQIngestionService:
     def __init__(self, 
                  embedding_service,  # AzureOpenAIEmbeddingService
                  vector_service,     # PostgreSQLVectorService
-                 chunking_service: Optional[TableChunkingService] = None):
+                 chunking_service: Optional[TableChunkingService] = None,
+                 bulk_mode: str = "insert",
+                 copy_batch_rows: int = 10000,
+                 embedding_batch_size: int = 64,
+                 embedding_cache: Optional[MutableMapping[str, Any]] = None,
+                 pipeline_batch_size: int = 500,
+                 max_concurrency: int = 8,
+                 embedding_lru_size: int = 5000,
+                 embedding_max_retries: int = 5,
+                 extraction_cache: Optional[MutableMapping[str, TableExtractionResult]] = None,
+                 embedding_dtype: str = "float32",
+                 hash_algo: str = "blake2b"):
         """
         Initialisiert die Tabellen-Pipeline
         
@@ -57,6 +88,28 @@ class TableFAQIngestionService:
             embedding_service: AzureOpenAIEmbeddingService
             vector_service: PostgreSQLVectorService  
             chunking_service: TableChunkingService (optional, wird erstellt wenn nicht vorhanden)
+            bulk_mode: "copy" für Bulk-Speicherung über vector_service.store_chunks (COPY), sonst "insert"
+            copy_batch_rows: Maximale Anzahl Chunks pro Bulk-Aufruf
+            embedding_batch_size: Maximale Anzahl Texte pro Embedding-Batch-Aufruf
+            embedding_cache: Optionaler Embedding-Cache (z.B. shelve oder DB-gestützt),
+                             Schlüssel: BLAKE2b über Modellname und Text
+            pipeline_batch_size: Chunks pro Pipeline-Stufe (Embedding von Batch i
+                                 läuft parallel zur Speicherung von Batch i-1)
+            max_concurrency: Maximale Anzahl gleichzeitiger Einzelaufrufe an
+                             Embedding- bzw. Vector-Service
+            embedding_lru_size: Maximale Anzahl Embeddings im prozessinternen LRU
+                                vor dem embedding_cache (0 = deaktiviert)
+            embedding_max_retries: Maximale Anzahl Wiederholungen eines Embedding-Aufrufs
+                                   bei Rate-Limits (exponentielles Backoff mit Jitter)
+            extraction_cache: Optionaler Cache für Extraktionsergebnisse (z.B. shelve als
+                              Disk-Cache), Schlüssel: Dokument-Hash und Dateiname
+            embedding_dtype: Datentyp des an den Vector-Service übergebenen Embeddings:
+                             "float32" (unverändert), "float16" (z.B. pgvector halfvec)
+                             oder "int8" (symmetrisch skaliert, Skalierung in
+                             metadata['embedding_scale']). Nur setzen, wenn die Zielspalte
+                             des Vector-Services diesen Typ hat.
+            hash_algo: Hash-Verfahren für document_hash: "blake2b" (schneller) oder
+                       "sha256" (z.B. für Audits bzw. Abgleich mit bisherigen Hashes)
         """
         # Spezialisierte Services
         self.extraction_service = TableExtractionService()
@@ -66,17 +119,421 @@ class TableFAQIngestionService:
         self.embedding_service = embedding_service
         self.vector_service = vector_service
         
+        # Speichermodus für Vector Storage
+        self.bulk_mode = bulk_mode
+        self.copy_batch_rows = copy_batch_rows
+        
+        # Batch-Größe für Embedding-Aufrufe
+        self.embedding_batch_size = embedding_batch_size
+        
+        # Embedding-Cache (None = deaktiviert)
+        self.embedding_cache = embedding_cache
+        
+        # Batch-Größe für die überlappende Embedding-/Storage-Pipeline
+        self.pipeline_batch_size = pipeline_batch_size
+        
+        # Begrenzung paralleler Einzelaufrufe (Rate-Limits)
+        self.max_concurrency = max_concurrency
+        
+        # Begrenzter prozessinterner Embedding-LRU (Schlüssel wie embedding_cache)
+        self.embedding_lru_size = embedding_lru_size
+        self._embedding_lru: OrderedDict[str, Any] = OrderedDict()
+        
+        # Wiederholungen bei Rate-Limits des Embedding-Services
+        if embedding_max_retries < 0:
+            raise ValueError(f"embedding_max_retries muss >= 0 sein: {embedding_max_retries}")
+        self.embedding_max_retries = embedding_max_retries
+        
+        # Extraktions-Cache (None = deaktiviert)
+        self.extraction_cache = extraction_cache
+        
+        # Quantisierung der Embeddings vor dem Speichern
+        if embedding_dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unbekannter embedding_dtype: {embedding_dtype}. Unterstützt: 'float32', 'float16', 'int8'")
+        self.embedding_dtype = embedding_dtype
+        
+        # Hash-Verfahren für den Dokument-Hash
+        if hash_algo not in ("blake2b", "sha256"):
+            raise ValueError(f"Unbekannter hash_algo: {hash_algo}. Unterstützt: 'blake2b', 'sha256'")
+        self.hash_algo = hash_algo
+        
         logger.info("✅ TableFAQIngestionService initialisiert")
     
-    def _generate_document_hash(self, content: bytes) -> str:
-        """Generiert Hash für Dokument"""
-        return hashlib.sha256(content).hexdigest()
+    def _generate_document_hash(self, content: Union[bytes, memoryview, BinaryIO]) -> str:
+        """
+        Generiert Hash für Dokument (hash_algo: BLAKE2b oder SHA-256, jeweils 64 Hex-Zeichen)
+        
+        Der Inhalt wird blockweise (1 MiB) in den Hasher gegeben: Puffer über
+        memoryview-Slices ohne Kopie, Datei-Objekte per read().
+        """
+        hasher = hashlib.blake2b(digest_size=32) if self.hash_algo == "blake2b" else hashlib.sha256()
+        if hasattr(content, 'read'):
+            while block := content.read(HASH_BLOCK_SIZE):
+                hasher.update(block)
+        else:
+            view = memoryview(content)
+            for start in range(0, len(view), HASH_BLOCK_SIZE):
+                hasher.update(view[start:start + HASH_BLOCK_SIZE])
+        return hasher.hexdigest()
+    
+    async def _extract_with_hash(self, filename: str, raw_content: bytes) -> tuple[str, TableExtractionResult]:
+        """
+        Extrahiert den Excel-Inhalt und berechnet den Dokument-Hash
+        
+        Ohne extraction_cache laufen Hash (Worker-Thread) und Extraktion parallel.
+        Mit Cache wird zuerst gehasht; bei einem Treffer entfällt die Extraktion,
+        fehlerfreie Ergebnisse werden im Cache abgelegt. Cache-Eintrag und
+        zurückgegebenes Ergebnis sind stets unabhängige Kopien.
+        """
+        if self.extraction_cache is None:
+            document_hash, extraction_result = await asyncio.gather(
+                asyncio.to_thread(self._generate_document_hash, raw_content),
+                self.extraction_service.extract(
+                    filename=filename,
+                    raw_content=raw_content
+                )
+            )
+            return document_hash, extraction_result
+        
+        document_hash = await asyncio.to_thread(self._generate_document_hash, raw_content)
+        cache_key = f"{document_hash}:{filename}"
+        
+        try:
+            extraction_result = self.extraction_cache.get(cache_key)
+        except Exception as e:
+            logger.warning("⚠️ Extraktions-Cache-Lookup fehlgeschlagen: %s", e)
+            extraction_result = None
+        
+        if extraction_result is not None:
+            logger.info("♻️ Extraktionsergebnis aus Cache verwendet: %s", filename)
+            # Eigene Kopie, damit Änderungen an Metadaten/Warnungen den Cache-Eintrag nicht verändern
+            return document_hash, copy.deepcopy(extraction_result)
+        
+        extraction_result = await self.extraction_service.extract(
+            filename=filename,
+            raw_content=raw_content
+        )
+        
+        if not extraction_result.processing_errors:
+            try:
+                self.extraction_cache[cache_key] = copy.deepcopy(extraction_result)
+            except Exception as e:
+                logger.warning("⚠️ Extraktionsergebnis konnte nicht im Cache abgelegt werden: %s", e)
+        
+        return document_hash, extraction_result
+    
+    def _embedding_cache_key(self, text: str) -> str:
+        """Cache-Schlüssel für ein Embedding (Modell + Text)"""
+        return hashlib.blake2b(f"{self.embedding_service.model_name}\x00{text}".encode('utf-8'), digest_size=32).hexdigest()
+    
+    def _get_cached_embedding(self, key: str) -> Optional[Any]:
+        """Sucht ein Embedding zuerst im LRU, dann im embedding_cache"""
+        embedding = self._embedding_lru.get(key)
+        if embedding is not None:
+            self._embedding_lru.move_to_end(key)
+            return embedding
+        
+        if self.embedding_cache is None:
+            return None
+        
+        try:
+            embedding = self.embedding_cache.get(key)
+        except Exception as e:
+            # Cache nicht erreichbar: wie ein Fehltreffer behandeln
+            logger.warning("⚠️ Embedding-Cache-Lookup fehlgeschlagen: %s", e)
+            return None
+        
+        if embedding is not None:
+            self._remember_embedding(key, embedding)
+        return embedding
+    
+    def _remember_embedding(self, key: str, embedding: Any) -> None:
+        """Legt ein Embedding im LRU ab und verdrängt die ältesten Einträge"""
+        if self.embedding_lru_size <= 0:
+            return
+        self._embedding_lru[key] = embedding
+        self._embedding_lru.move_to_end(key)
+        while len(self._embedding_lru) > self.embedding_lru_size:
+            self._embedding_lru.popitem(last=False)
+    
+    async def _embed_chunks(self, chunks: List[TableChunk]) -> None:
+        """
+        Erzeugt Embeddings für alle Chunks
+        
+        Gleiche Texte werden innerhalb eines Aufrufs nur einmal eingebettet (auch
+        ohne Cache). Bekannte Texte werden aus dem LRU bzw. embedding_cache
+        übernommen; nur die übrigen Chunks gehen an den Embedding-Service. Fehler
+        des Caches (z.B. DB-gestützter Cache nicht erreichbar) brechen die
+        Ingestion nicht ab.
+        """
+        use_cache = self.embedding_cache is not None or self.embedding_lru_size > 0
+        pending = []
+        pending_keys = {}   # Schlüssel -> erster Chunk mit diesem Text
+        duplicates = []     # (Chunk, erster Chunk mit gleichem Text)
+        
+        for chunk in chunks:
+            key = self._embedding_cache_key(chunk.content) if use_cache else chunk.content
+            embedding = self._get_cached_embedding(key) if use_cache else None
+            if embedding is not None:
+                chunk.metadata['embedding'] = embedding
+                chunk.metadata['embedding_model'] = self.embedding_service.model_name
+            elif key in pending_keys:
+                duplicates.append((chunk, pending_keys[key]))
+            else:
+                pending_keys[key] = chunk
+                pending.append(chunk)
+        
+        if use_cache:
+            logger.info("♻️ Embedding-Cache: %d Treffer, %d neu zu berechnen", len(chunks) - len(pending), len(pending))
+        
+        if hasattr(self.embedding_service, 'get_text_embeddings_batch'):
+            await self._embed_chunks_batched(pending)
+        else:
+            await self._embed_chunks_individually(pending)
+        
+        # Neu berechnete Embeddings im LRU und Cache ablegen
+        cache_writable = self.embedding_cache is not None
+        for key, chunk in pending_keys.items():
+            embedding = chunk.metadata.get('embedding')
+            if not use_cache or embedding is None:
+                continue
+            self._remember_embedding(key, embedding)
+            if cache_writable:
+                try:
+                    self.embedding_cache[key] = embedding
+                except Exception as e:
+                    logger.warning("⚠️ Embedding konnte nicht im Cache abgelegt werden: %s", e)
+                    cache_writable = False
+        
+        # Doppelte Texte übernehmen das Ergebnis des ersten Chunks
+        for chunk, source_chunk in duplicates:
+            for field in ('embedding', 'embedding_model', 'embedding_error'):
+                if field in source_chunk.metadata:
+                    chunk.metadata[field] = source_chunk.metadata[field]
+    
+    async def _call_embedding_with_retry(self, method: Callable[[Any], Awaitable[Any]], argument: Any) -> Any:
+        """
+        Ruft eine Embedding-Methode auf und wiederholt den Aufruf bei Rate-Limits
+        
+        Wartezeit: min(EMBEDDING_RETRY_BASE_DELAY * 2^Versuch, EMBEDDING_RETRY_MAX_DELAY)
+        plus bis zu einer Sekunde Jitter. Andere Fehler werden sofort weitergereicht.
+        """
+        for attempt in range(self.embedding_max_retries + 1):
+            try:
+                return await method(argument)
+            except Exception as e:
+                if attempt == self.embedding_max_retries or not _is_rate_limit_error(e):
+                    raise
+                delay = min(EMBEDDING_RETRY_BASE_DELAY * 2 ** attempt, EMBEDDING_RETRY_MAX_DELAY) + random.uniform(0, 1)
+                logger.warning("⏳ Rate-Limit beim Embedding, Versuch %d/%d in %.1f s",
+                               attempt + 2, self.embedding_max_retries + 1, delay)
+                await asyncio.sleep(delay)
+    
+    async def _embed_chunks_batched(self, chunks: List[TableChunk]) -> None:
+        """
+        Erzeugt Embeddings gebündelt über embedding_service.get_text_embeddings_batch
+        
+        Ein Aufruf pro embedding_batch_size Chunks statt einem Aufruf pro Chunk.
+        Schlägt ein Batch fehl, werden die Chunks dieses Batches einzeln eingebettet;
+        bei einem Rate-Limit (Wiederholungen ausgeschöpft) erhalten sie stattdessen
+        embedding_error, um den Service nicht mit Einzelaufrufen weiter zu belasten.
+        """
+        for start in range(0, len(chunks), self.embedding_batch_size):
+            batch = chunks[start:start + self.embedding_batch_size]
+            try:
+                embeddings = await self._call_embedding_with_retry(
+                    self.embedding_service.get_text_embeddings_batch,
+                    [chunk.content for chunk in batch]
+                )
+                if len(embeddings) != len(batch):
+                    # Unvollständige Antwort: wie ein fehlgeschlagener Batch behandeln (Einzelaufrufe)
+                    raise ValueError(f"Embedding-Service lieferte {len(embeddings)} statt {len(batch)} Embeddings")
+                for chunk, embedding in zip(batch, embeddings):
+                    chunk.metadata['embedding'] = embedding
+                    chunk.metadata['embedding_model'] = self.embedding_service.model_name
+                    
+            except Exception as e:
+                if _is_rate_limit_error(e):
+                    logger.error("❌ Rate-Limit beim Batch-Embedding von %d Chunks, Wiederholungen ausgeschöpft: %s", len(batch), e)
+                    for chunk in batch:
+                        chunk.metadata['embedding_error'] = str(e)
+                    continue
+                logger.error("❌ Fehler beim Batch-Embedding von %d Chunks, verarbeite einzeln: %s", len(batch), e)
+                await self._embed_chunks_individually(batch)
+    
+    async def _embed_chunks_individually(self, chunks: List[TableChunk]) -> None:
+        """
+        Erzeugt Embeddings einzeln über embedding_service.get_text_embedding
+        
+        Die Aufrufe laufen nebenläufig, höchstens max_concurrency gleichzeitig.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def embed_chunk(chunk: TableChunk) -> None:
+            async with semaphore:
+                try:
+                    # Embedding für Chunk-Inhalt generieren
+                    embedding = await self._call_embedding_with_retry(
+                        self.embedding_service.get_text_embedding, chunk.content
+                    )
+                    
+                    # Embedding zu Chunk-Metadaten hinzufügen
+                    chunk.metadata['embedding'] = embedding
+                    chunk.metadata['embedding_model'] = self.embedding_service.model_name
+                    
+                except Exception as e:
+                    logger.error("❌ Fehler beim Embedding für Chunk %s: %s", chunk.chunk_id, e)
+                    chunk.metadata['embedding_error'] = str(e)
+        
+        await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+    
+    def _storage_embedding(self, chunk: TableChunk) -> Any:
+        """
+        Embedding eines Chunks im Format embedding_dtype für den embedding-Parameter
+        des Vector-Services (float32: unverändert)
+        
+        Das quantisierte Array wird nur übergeben, chunk.metadata behält das
+        Embedding des Services (JSON-serialisierbar) und erhält embedding_dtype
+        sowie bei int8 die Skalierung (embedding ≈ int8_werte * embedding_scale).
+        """
+        embedding = chunk.metadata.get('embedding')
+        if embedding is None or self.embedding_dtype == "float32":
+            return embedding
+        
+        vector = np.asarray(embedding, dtype=np.float32)
+        chunk.metadata['embedding_dtype'] = self.embedding_dtype
+        if self.embedding_dtype == "float16":
+            return vector.astype(np.float16)
+        
+        max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = max_abs / 127 if max_abs > 0 else 1.0
+        chunk.metadata['embedding_scale'] = scale
+        return np.round(vector / scale).astype(np.int8)
+    
+    async def _store_chunks(self, chunks: List[TableChunk]) -> List[Any]:
+        """Speichert Chunks je nach bulk_mode gebündelt oder einzeln"""
+        if self.bulk_mode == "copy" and hasattr(self.vector_service, 'store_chunks'):
+            return await self._store_chunks_bulk(chunks)
+        return await self._store_chunks_individually(chunks)
+    
+    async def _embed_and_store_pipelined(self, chunks: List[TableChunk]) -> List[Any]:
+        """
+        Erzeugt Embeddings und speichert Chunks überlappend in Batches
+        
+        Während Batch i eingebettet wird (Netzwerk), wird Batch i-1 bereits
+        gespeichert (Datenbank). Die Queue ist auf zwei Batches begrenzt, die
+        Speicherreihenfolge entspricht der Chunk-Reihenfolge.
+        
+        Beide Stufen laufen in einer TaskGroup: schlägt eine Stufe fehl, wird die
+        andere abgebrochen und der ursprüngliche Fehler weitergereicht.
+        
+        Returns:
+            List[Any]: Gespeicherte Chunks
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        
+        async def embed_stage() -> None:
+            for start in range(0, len(chunks), self.pipeline_batch_size):
+                batch = chunks[start:start + self.pipeline_batch_size]
+                await self._embed_chunks(batch)
+                await queue.put(batch)
+            await queue.put(None)
+        
+        async def store_stage() -> List[Any]:
+            stored_chunks = []
+            while (batch := await queue.get()) is not None:
+                stored_chunks.extend(await self._store_chunks(batch))
+            return stored_chunks
+        
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(embed_stage(), name="table-faq-embed")
+                store_task = task_group.create_task(store_stage(), name="table-faq-store")
+        except BaseExceptionGroup as error_group:
+            # Einzelnen Fehler unverändert weitergeben (wie vor der TaskGroup)
+            if len(error_group.exceptions) == 1:
+                raise error_group.exceptions[0]
+            raise
+        
+        return store_task.result()
+    
+    def _collect_chunk_errors(self, chunks: List[TableChunk]) -> List[Dict[str, Any]]:
+        """Sammelt Embedding- und Speicherfehler einzelner Chunks als processing_errors"""
+        chunk_errors = []
+        for chunk in chunks:
+            for field, error_type in (('embedding_error', 'embedding_failed'), ('storage_error', 'storage_failed')):
+                if field in chunk.metadata:
+                    chunk_errors.append({
+                        'message': f"Chunk {chunk.chunk_id}: {chunk.metadata[field]}",
+                        'error_type': error_type,
+                        'details': {
+                            'chunk_id': chunk.chunk_id,
+                            'error': chunk.metadata[field]
+                        }
+                    })
+        return chunk_errors
+    
+    async def _store_chunks_bulk(self, chunks: List[TableChunk]) -> List[Any]:
+        """
+        Speichert Chunks gebündelt über vector_service.store_chunks (COPY ... FROM STDIN)
+        
+        Schlägt ein Bulk-Aufruf fehl, werden die Chunks dieses Batches einzeln gespeichert.
+        """
+        stored_chunks = []
+        for start in range(0, len(chunks), self.copy_batch_rows):
+            batch = chunks[start:start + self.copy_batch_rows]
+            try:
+                stored_batch = await self.vector_service.store_chunks([
+                    {
+                        'chunk_id': chunk.chunk_id,
+                        'content': chunk.content,
+                        'embedding': self._storage_embedding(chunk),
+                        'metadata': chunk.metadata
+                    }
+                    for chunk in batch
+                ])
+                stored_chunks.extend(stored_batch)
+                
+            except Exception as e:
+                logger.error("❌ Fehler beim Bulk-Speichern von %d Chunks, speichere einzeln: %s", len(batch), e)
+                stored_chunks.extend(await self._store_chunks_individually(batch))
+        
+        return stored_chunks
+    
+    async def _store_chunks_individually(self, chunks: List[TableChunk]) -> List[Any]:
+        """
+        Speichert Chunks einzeln über vector_service.store_chunk
+        
+        Die Aufrufe laufen nebenläufig, höchstens max_concurrency gleichzeitig;
+        die Reihenfolge der Ergebnisse entspricht der Chunk-Reihenfolge.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def store_chunk(chunk: TableChunk) -> tuple[bool, Any]:
+            async with semaphore:
+                try:
+                    # Chunk in Vector-Datenbank speichern
+                    stored_chunk = await self.vector_service.store_chunk(
+                        chunk_id=chunk.chunk_id,
+                        content=chunk.content,
+                        embedding=self._storage_embedding(chunk),
+                        metadata=chunk.metadata
+                    )
+                    return True, stored_chunk
+                    
+                except Exception as e:
+                    logger.error("❌ Fehler beim Speichern von Chunk %s: %s", chunk.chunk_id, e)
+                    chunk.metadata['storage_error'] = str(e)
+                    return False, None
+        
+        results = await asyncio.gather(*(store_chunk(chunk) for chunk in chunks))
+        return [stored_chunk for stored, stored_chunk in results if stored]
     
     def _create_document_metadata(self, 
                                 document_id: str,
                                 document_source: str,
                                 extraction_result: TableExtractionResult,
-                                chunking_result: TableChunkingResult,
+                                chunks_count: int = 0,
                                 **kwargs) -> TableDocumentMetadata:
         """Erstellt Metadaten für Tabellen-Dokument"""
         return TableDocumentMetadata(
@@ -88,14 +545,15 @@ class TableFAQIngestionService:
             description=kwargs.get('description'),
             filename=kwargs.get('filename'),
             file_size=kwargs.get('file_size'),
+            document_hash=kwargs.get('document_hash'),
             created_at=datetime.now(),
             
             # Tabellen-spezifische Metadaten
             sheet_name=extraction_result.sheet_name,
             total_rows=extraction_result.total_rows,
             total_columns=extraction_result.total_columns,
-            qa_pairs_count=extraction_result.qa_pairs,
-            chunks_count=chunking_result.total_chunks,
+            qa_pairs_count=len(extraction_result.qa_pairs),
+            chunks_count=chunks_count,
             
             # Fehlerbehandlung
             processing_errors=extraction_result.processing_errors,
@@ -111,6 +569,7 @@ class TableFAQIngestionService:
                           documentMimeType: Optional[str] = None,
                           documentInternal: Optional[str] = None,
                           desc: Optional[str] = None,
+                          rebuild_index: bool = False,
                           **kwargs) -> TableDocumentMetadata:
         """
         Vollständige Tabellen-Ingestion Pipeline
@@ -124,36 +583,36 @@ class TableFAQIngestionService:
             documentMimeType: MIME-Type
             documentInternal: Internes Dokument
             desc: Beschreibung
+            rebuild_index: Vektor-Index nach dem Speichern über
+                           vector_service.rebuild_index neu aufbauen (z.B. bei
+                           Erstbefüllung mit deaktiviertem Index)
             **kwargs: Zusätzliche Parameter
             
         Returns:
             TableDocumentMetadata: Verarbeitete Metadaten
         """
         try:
-            logger.info(f"🚀 Starte Tabellen-Ingestion für: {filename}")
+            logger.info("🚀 Starte Tabellen-Ingestion für: %s", filename)
             
-            # 1. EXTRACTION: Excel-Inhalt extrahieren
+            # 1. EXTRACTION: Excel-Inhalt extrahieren (mit Dokument-Hash, ggf. aus Cache)
             logger.info("📖 Schritt 1: Extraktion")
-            extraction_result = await self.extraction_service.extract(
-                filename=filename,
-                raw_content=raw_content
-            )
+            document_hash, extraction_result = await self._extract_with_hash(filename, raw_content)
             
             # Prüfe auf Extraktionsfehler
             if extraction_result.processing_errors:
-                logger.error(f"❌ Extraktionsfehler: {extraction_result.processing_errors}")
+                logger.error("❌ Extraktionsfehler: %s", extraction_result.processing_errors)
                 # Erstelle Metadaten mit Fehlern
                 metadata = self._create_document_metadata(
                     document_id=documentId,
                     document_source=documentSource,
                     extraction_result=extraction_result,
-                    chunking_result=TableChunkingResult(chunks=[], total_chunks=0, metadata={}),
                     document_class=documentClass,
                     document_mime_type=documentMimeType,
                     document_internal=documentInternal,
                     description=desc,
                     filename=filename,
-                    file_size=len(raw_content)
+                    file_size=len(raw_content),
+                    document_hash=document_hash
                 )
                 return metadata
             
@@ -165,38 +624,18 @@ class TableFAQIngestionService:
                 qa_pairs=extraction_result.qa_pairs
             )
             
-            # 3. EMBEDDING: Embeddings für jeden Chunk generieren
+            # 3. EMBEDDING + 4. VECTOR STORAGE: überlappend in Batches
             logger.info("🧠 Schritt 3: Embedding-Generierung")
-            for chunk in chunking_result.chunks:
-                try:
-                    # Embedding für Chunk-Inhalt generieren
-                    embedding = await self.embedding_service.get_text_embedding(chunk.content)
-                    
-                    # Embedding zu Chunk-Metadaten hinzufügen
-                    chunk.metadata['embedding'] = embedding
-                    chunk.metadata['embedding_model'] = self.embedding_service.model_name
-                    
-                except Exception as e:
-                    logger.error(f"❌ Fehler beim Embedding für Chunk {chunk.chunk_id}: {str(e)}")
-                    chunk.metadata['embedding_error'] = str(e)
+            logger.info("💾 Schritt 4: Vector Storage (überlappend mit Schritt 3)")
+            stored_chunks = await self._embed_and_store_pipelined(chunking_result.chunks)
             
-            # 4. VECTOR STORAGE: Chunks in Vector-Datenbank speichern
-            logger.info("💾 Schritt 4: Vector Storage")
-            stored_chunks = []
-            for chunk in chunking_result.chunks:
-                try:
-                    # Chunk in Vector-Datenbank speichern
-                    stored_chunk = await self.vector_service.store_chunk(
-                        chunk_id=chunk.chunk_id,
-                        content=chunk.content,
-                        embedding=chunk.metadata.get('embedding'),
-                        metadata=chunk.metadata
-                    )
-                    stored_chunks.append(stored_chunk)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Fehler beim Speichern von Chunk {chunk.chunk_id}: {str(e)}")
-                    chunk.metadata['storage_error'] = str(e)
+            # Index erst nach dem Laden aller Vektoren aufbauen
+            if rebuild_index:
+                if hasattr(self.vector_service, 'rebuild_index'):
+                    logger.info("🔄 Baue Vektor-Index neu auf")
+                    await self.vector_service.rebuild_index()
+                else:
+                    logger.warning("⚠️ %s unterstützt kein rebuild_index", type(self.vector_service).__name__)
             
             # 5. METADATA: Dokument-Metadaten erstellen
             logger.info("📋 Schritt 5: Metadaten-Erstellung")
@@ -204,15 +643,22 @@ class TableFAQIngestionService:
                 document_id=documentId,
                 document_source=documentSource,
                 extraction_result=extraction_result,
-                chunking_result=chunking_result,
+                chunks_count=chunking_result.total_chunks,
                 document_class=documentClass,
                 document_mime_type=documentMimeType,
                 document_internal=documentInternal,
                 description=desc,
                 filename=filename,
-                file_size=len(raw_content)
+                file_size=len(raw_content),
+                document_hash=document_hash
             )
             
+            # Fehler einzelner Chunks (Embedding/Speicherung) mit ausweisen
+            chunk_errors = self._collect_chunk_errors(chunking_result.chunks)
+            if chunk_errors:
+                logger.warning("⚠️ %d Chunk-Fehler bei Embedding/Speicherung", len(chunk_errors))
+                metadata.processing_errors = [*extraction_result.processing_errors, *chunk_errors]
+            
             # Erweiterte Metadaten für Vector Storage
             metadata.vector_storage_info = {
                 'stored_chunks': len(stored_chunks),
@@ -221,26 +667,50 @@ class TableFAQIngestionService:
                 'vector_service': type(self.vector_service).__name__
             }
             
-            logger.info(f"✅ Tabellen-Ingestion erfolgreich abgeschlossen:")
-            logger.info(f"   📊 QA-Paare: {extraction_result.qa_pairs}")
-            logger.info(f"   🔪 Chunks: {chunking_result.total_chunks}")
-            logger.info(f"   💾 Gespeicherte Vektoren: {len(stored_chunks)}")
-            logger.info(f"   📋 Tabellenblatt: {extraction_result.sheet_name}")
+            logger.info("✅ Tabellen-Ingestion erfolgreich abgeschlossen:")
+            logger.info("   📊 QA-Paare: %d", len(extraction_result.qa_pairs))
+            logger.info("   🔪 Chunks: %d", chunking_result.total_chunks)
+            logger.info("   💾 Gespeicherte Vektoren: %d", len(stored_chunks))
+            logger.info("   📋 Tabellenblatt: %s", extraction_result.sheet_name)
             
             return metadata
             
         except Exception as e:
-            logger.error(f"❌ Fehler in Tabellen-Ingestion Pipeline: {str(e)}")
+            logger.error("❌ Fehler in Tabellen-Ingestion Pipeline: %s", e)
             raise
 
 # Factory-Funktion für Tabellen-Pipeline
-def create_table_faq_ingestion_service(embedding_service, vector_service, **kwargs) -> TableFAQIngestionService:
+def create_table_faq_ingestion_service(embedding_service,
+                                       vector_service,
+                                       bulk_mode: str = "insert",
+                                       copy_batch_rows: int = 10000,
+                                       embedding_batch_size: int = 64,
+                                       embedding_cache: Optional[MutableMapping[str, Any]] = None,
+                                       pipeline_batch_size: int = 500,
+                                       max_concurrency: int = 8,
+                                       embedding_lru_size: int = 5000,
+                                       embedding_max_retries: int = 5,
+                                       extraction_cache: Optional[MutableMapping[str, TableExtractionResult]] = None,
+                                       embedding_dtype: str = "float32",
+                                       hash_algo: str = "blake2b",
+                                       **kwargs) -> TableFAQIngestionService:
     """
     Erstellt spezialisierte Tabellen-Pipeline
     
     Args:
         embedding_service: AzureOpenAIEmbeddingService
         vector_service: PostgreSQLVectorService
+        bulk_mode: "copy" für Bulk-Speicherung der Vektoren, sonst "insert"
+        copy_batch_rows: Maximale Anzahl Chunks pro Bulk-Aufruf
+        embedding_batch_size: Maximale Anzahl Texte pro Embedding-Batch-Aufruf
+        embedding_cache: Optionaler Embedding-Cache (Mapping Hash -> Embedding)
+        pipeline_batch_size: Chunks pro Stufe der Embedding-/Storage-Pipeline
+        max_concurrency: Maximale Anzahl gleichzeitiger Einzelaufrufe
+        embedding_lru_size: Maximale Anzahl Embeddings im prozessinternen LRU
+        embedding_max_retries: Maximale Wiederholungen eines Embedding-Aufrufs bei Rate-Limits
+        extraction_cache: Optionaler Cache für Extraktionsergebnisse (Mapping Schlüssel -> Ergebnis)
+        embedding_dtype: Datentyp der gespeicherten Embeddings ("float32", "float16", "int8")
+        hash_algo: Hash-Verfahren für document_hash ("blake2b" oder "sha256")
         **kwargs: Zusätzliche Parameter für ChunkingService
         
     Returns:
@@ -250,5 +720,16 @@ def create_table_faq_ingestion_service(embedding_service, vector_service, **kwar
     return TableFAQIngestionService(
         embedding_service=embedding_service,
         vector_service=vector_service,
-        chunking_service=chunking_service
+        chunking_service=chunking_service,
+        bulk_mode=bulk_mode,
+        copy_batch_rows=copy_batch_rows,
+        embedding_batch_size=embedding_batch_size,
+        embedding_cache=embedding_cache,
+        pipeline_batch_size=pipeline_batch_size,
+        max_concurrency=max_concurrency,
+        embedding_lru_size=embedding_lru_size,
+        embedding_max_retries=embedding_max_retries,
+        extraction_cache=extraction_cache,
+        embedding_dtype=embedding_dtype,
+        hash_algo=hash_algo
     )
@@ -6,27 +6,37 @@ Unterstützt die Spalten: ID, Frage, Antwort, Kommentar
 Kann als Bibliothek in andere Services eingebunden werden
 """
 
+import codecs
+import re
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Any, Union, Tuple, Optional
+from typing import Dict, List, Any, Union, Tuple, Optional, Iterator
 from pathlib import Path
 import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data_reader.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Logging wird nur bei Kommandozeilen-Verwendung konfiguriert (siehe main()),
+# eingebundene Services nutzen ihre eigene Konfiguration
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Kanonisches UUID-Format (8-4-4-4-12 Hex-Zeichen)
+_UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+# Encodings für CSV-Dateien in Prüfreihenfolge (utf-8-sig entfernt ein evtl. BOM wie pandas)
+CSV_ENCODINGS = ['utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# Excel-Engine für pd.read_excel: python-calamine (Rust-basiert, liest auch .xls/.xlsb),
+# openpyxl nur als Fallback wenn python-calamine nicht installiert ist
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+@dataclass(slots=True, frozen=True)
 class DocumentMetadata:
     """Metadaten für ein Dokument"""
     document_id: str
@@ -37,7 +47,7 @@ class DocumentMetadata:
     total_rows: int
     total_columns: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QuestionAnswerPair:
     """Ein Frage-Antwort-Paar mit Metadaten"""
     question_id: str
@@ -56,16 +66,15 @@ class DataTypeDetector:
         if pd.isna(value):
             return "NULL"
         
-        value_str = str(value).strip()
-        
+        return DataTypeDetector._detect_id_string_type(str(value).strip())
+    
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _detect_id_string_type(value_str: str) -> str:
+        """Klassifiziert einen bereinigten ID-String (zwischengespeichert, da IDs sich oft wiederholen)"""
         # Prüfe auf UUID
-        if len(value_str) == 36 and value_str.count('-') == 4:
-            try:
-                import uuid
-                uuid.UUID(value_str)
-                return "UUID"
-            except ValueError:
-                pass
+        if _UUID_PATTERN.fullmatch(value_str):
+            return "UUID"
         
         # Prüfe auf Integer
         try:
@@ -106,57 +115,96 @@ class DataTypeDetector:
         else:
             return "VERY_LONG_TEXT"
     
+    @staticmethod
+    def _detect_id_types(values: pd.Series, column: Optional[pd.Series] = None) -> np.ndarray:
+        """
+        Spaltenweise Variante von detect_id_type für bereinigte String-Werte
+        
+        Zahlen werden in einem Schritt per pd.to_numeric klassifiziert, nur die
+        übrigen (eindeutigen) Werte laufen durch detect_id_type (UUID, STRING, ...).
+        Ist die Originalspalte (column) bereits numerisch, entfällt das Parsen der Strings.
+        """
+        null_mask = values.isna().to_numpy()
+        
+        if column is not None and pd.api.types.is_integer_dtype(column):
+            return np.where(null_mask, "NULL", "INTEGER").astype(object)
+        
+        if column is not None and pd.api.types.is_float_dtype(column):
+            numbers = column
+        else:
+            numbers = pd.to_numeric(values, errors='coerce')
+        numeric_mask = numbers.notna().to_numpy()
+        number_values = numbers.to_numpy(dtype=float, na_value=np.nan)
+        
+        with np.errstate(invalid='ignore'):
+            is_integer = np.isfinite(number_values) & (np.floor(number_values) == number_values)
+        types = np.where(is_integer, "INTEGER", "FLOAT").astype(object)
+        types[null_mask] = "NULL"
+        
+        other_mask = ~numeric_mask & ~null_mask
+        if other_mask.any():
+            other_values = values[other_mask]
+            detected = {value: DataTypeDetector.detect_id_type(value) for value in other_values.unique()}
+            types[other_mask] = other_values.map(detected).to_numpy(dtype=object)
+        
+        return types
+    
+    @staticmethod
+    def _detect_text_types(values: pd.Series, max_length: int = 1000) -> np.ndarray:
+        """Spaltenweise Variante von detect_text_type für bereinigte String-Werte"""
+        lengths = values.str.len().fillna(-1).to_numpy(dtype=np.int64)
+        return np.select(
+            [lengths < 0, lengths == 0, lengths <= 50, lengths <= 200, lengths <= max_length],
+            ["NULL", "EMPTY", "SHORT_TEXT", "MEDIUM_TEXT", "LONG_TEXT"],
+            default="VERY_LONG_TEXT"
+        ).astype(object)
+    
     @staticmethod
     def validate_data_types(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
         """Validiert alle Spalten und erkennt Datentypen"""
         column_analysis = {}
         
         for column in df.columns:
-            logger.info(f"Analysiere Spalte: {column}")
+            logger.info("Analysiere Spalte: %s", column)
+            
+            # Alle Werte der Spalte einmal als bereinigte Strings
+            values = df[column].astype("string").str.strip()
             
             # Datentyp-Erkennung basierend auf Spaltenname
             if column.lower() == 'id':
-                type_func = DataTypeDetector.detect_id_type
+                types = DataTypeDetector._detect_id_types(values, df[column])
             else:
-                type_func = DataTypeDetector.detect_text_type
-            
-            # Analysiere alle Werte in der Spalte
-            types = []
-            null_count = 0
-            empty_count = 0
-            unique_values = set()
+                types = DataTypeDetector._detect_text_types(values)
             
-            for value in df[column]:
-                if pd.isna(value):
-                    null_count += 1
-                    types.append("NULL")
-                else:
-                    detected_type = type_func(value)
-                    types.append(detected_type)
-                    
-                    if detected_type == "EMPTY":
-                        empty_count += 1
-                    
-                    unique_values.add(str(value).strip())
+            null_count = int(values.isna().sum())
+            empty_count = int((types == "EMPTY").sum())
+            unique_values = values.dropna().drop_duplicates()
             
-            # Häufigste Datentypen
-            type_counts = pd.Series(types).value_counts()
-            dominant_type = type_counts.index[0] if len(type_counts) > 0 else "UNKNOWN"
+            # Häufigste Datentypen (absteigend nach Anzahl, bei Gleichstand erstes Vorkommen zuerst)
+            labels, first_index, counts = np.unique(types, return_index=True, return_counts=True)
+            order = np.lexsort((first_index, -counts))
+            type_distribution = dict(zip(labels[order].tolist(), counts[order].tolist()))
+            dominant_type = next(iter(type_distribution), "UNKNOWN")
+            total_count = len(df)
             
             column_analysis[column] = {
                 'dominant_type': dominant_type,
-                'type_distribution': type_counts.to_dict(),
+                'type_distribution': type_distribution,
                 'null_count': null_count,
                 'empty_count': empty_count,
                 'unique_count': len(unique_values),
-                'total_count': len(df),
-                'sample_values': list(unique_values)[:5]  # Erste 5 eindeutige Werte
+                'total_count': total_count,
+                'sample_values': unique_values.head(5).tolist(),  # Erste 5 eindeutige Werte
+                # Anteile (0-1) für Bericht und Qualitäts-Score
+                'null_pct': null_count / total_count if total_count else 0.0,
+                'empty_pct': empty_count / total_count if total_count else 0.0,
+                'dominant_pct': type_distribution.get(dominant_type, 0) / total_count if total_count else 0.0
             }
             
-            logger.info(f"  Dominanter Typ: {dominant_type}")
-            logger.info(f"  NULL-Werte: {null_count}")
-            logger.info(f"  Leere Werte: {empty_count}")
-            logger.info(f"  Eindeutige Werte: {len(unique_values)}")
+            logger.info("  Dominanter Typ: %s", dominant_type)
+            logger.info("  NULL-Werte: %d", null_count)
+            logger.info("  Leere Werte: %d", empty_count)
+            logger.info("  Eindeutige Werte: %d", len(unique_values))
         
         return column_analysis
 
@@ -165,36 +213,35 @@ class DataReader:
     
     def __init__(self, file_path: str):
         self.file_path = Path(file_path)
+        self.file_extension = self.file_path.suffix.lower()
         self.data = None
         self.analysis = None
         self.metadata = None
         
+        # Zuletzt extrahierte QA-Spalten/-Paare (Schlüssel: Spaltennamen), gültig bis zum nächsten read_file()
+        self._qa_columns_cache: Optional[Tuple[Tuple[str, ...], Dict[str, np.ndarray]]] = None
+        self._qa_pairs_cache: Optional[Tuple[Tuple[str, ...], List[QuestionAnswerPair]]] = None
+        
         if not self.file_path.exists():
             raise FileNotFoundError(f"Datei nicht gefunden: {file_path}")
     
     def read_file(self) -> pd.DataFrame:
         """Liest die Datei basierend auf der Dateiendung"""
         try:
-            file_extension = self.file_path.suffix.lower()
+            file_extension = self.file_extension
+            self._qa_columns_cache = None
+            self._qa_pairs_cache = None
             
             if file_extension in ['.xlsx', '.xls']:
-                logger.info(f"Lese Excel-Datei: {self.file_path}")
-                self.data = pd.read_excel(self.file_path, engine='openpyxl')
+                logger.info("Lese Excel-Datei: %s", self.file_path)
+                self.data = pd.read_excel(self.file_path, engine=EXCEL_ENGINE)
             
             elif file_extension == '.csv':
-                logger.info(f"Lese CSV-Datei: {self.file_path}")
-                # Versuche verschiedene Encodings
-                encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-                
-                for encoding in encodings:
-                    try:
-                        self.data = pd.read_csv(self.file_path, encoding=encoding)
-                        logger.info(f"Erfolgreich mit Encoding: {encoding}")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    raise ValueError("Kein passendes Encoding gefunden")
+                logger.info("Lese CSV-Datei: %s", self.file_path)
+                # Encoding blockweise per Dekodierung bestimmen, danach genau ein CSV-Parse
+                encoding = self._detect_csv_encoding()
+                self.data = pd.read_csv(self.file_path, encoding=encoding)
+                logger.info("Erfolgreich mit Encoding: %s", encoding)
             
             else:
                 raise ValueError(f"Nicht unterstützter Dateityp: {file_extension}")
@@ -204,8 +251,8 @@ class DataReader:
             missing_columns = [col for col in expected_columns if col not in self.data.columns]
             
             if missing_columns:
-                logger.warning(f"Fehlende Spalten: {missing_columns}")
-                logger.info(f"Verfügbare Spalten: {list(self.data.columns)}")
+                logger.warning("Fehlende Spalten: %s", missing_columns)
+                logger.info("Verfügbare Spalten: %s", list(self.data.columns))
             
             # Bereinige Spaltennamen (entferne Leerzeichen, normalisiere)
             self.data.columns = self.data.columns.str.strip()
@@ -213,7 +260,7 @@ class DataReader:
             return self.data
             
         except Exception as e:
-            logger.error(f"Fehler beim Lesen der Datei: {str(e)}")
+            logger.error("Fehler beim Lesen der Datei: %s", e)
             raise
     
     def analyze_data(self) -> Dict[str, Dict[str, Any]]:
@@ -225,6 +272,156 @@ class DataReader:
         self.analysis = DataTypeDetector.validate_data_types(self.data)
         return self.analysis
     
+    def _extract_qa_columns(self,
+                            id_column: str = 'ID',
+                            question_column: str = 'Frage',
+                            answer_column: str = 'Antwort',
+                            comment_column: str = 'Kommentar') -> Dict[str, np.ndarray]:
+        """
+        Extrahiert die gültigen Frage-Antwort-Zeilen spaltenweise
+        
+        Gibt je ein Array für question_ids, questions, answers, comments und
+        row_indices zurück (gleiche Länge, gleiche Reihenfolge). Das Ergebnis
+        wird je Spaltenkombination bis zum nächsten read_file() zwischengespeichert.
+        """
+        if self.data is None:
+            raise ValueError("Keine Daten geladen. Führe zuerst read_file() aus.")
+        
+        cache_key = (id_column, question_column, answer_column, comment_column)
+        if self._qa_columns_cache is not None and self._qa_columns_cache[0] == cache_key:
+            return self._qa_columns_cache[1]
+        
+        qa_columns = self._qa_columns_from_frame(self.data, *cache_key)
+        
+        logger.info("Erfolgreich %d Frage-Antwort-Paare extrahiert", len(qa_columns['row_indices']))
+        self._qa_columns_cache = (cache_key, qa_columns)
+        return qa_columns
+    
+    @staticmethod
+    def _qa_columns_from_frame(data: pd.DataFrame,
+                               id_column: str,
+                               question_column: str,
+                               answer_column: str,
+                               comment_column: str) -> Dict[str, np.ndarray]:
+        """Bestimmt die gültigen Frage-Antwort-Zeilen eines DataFrames (bzw. Blocks) spaltenweise"""
+        def text_column(column: str) -> pd.Series:
+            """Spalte als bereinigte Strings (fehlende Spalte: leere Strings)"""
+            if column not in data.columns:
+                return pd.Series("", index=data.index, dtype="string")
+            return data[column].astype("string").str.strip()
+        
+        # Spaltenweise bereinigen und gültige Zeilen in einem Schritt bestimmen
+        questions = text_column(question_column)
+        answers = text_column(answer_column)
+        mask = (questions.notna() & answers.notna() &
+                questions.ne("") & answers.ne("") &
+                questions.ne("nan") & answers.ne("nan")).fillna(False).to_numpy(dtype=bool)
+        
+        # Übersprungene Zeilen gesammelt melden statt einer Warnung je Zeile
+        skipped_rows = data.index[~mask]
+        if len(skipped_rows):
+            logger.warning("%d Zeilen mit leerer Frage oder Antwort übersprungen (z.B. Zeilen %s)",
+                           len(skipped_rows), skipped_rows[:10].tolist())
+        
+        # IDs: fehlende Werte bzw. fehlende Spalte -> row_<index>
+        row_indices = data.index[mask]
+        fallback_ids = pd.Series([f"row_{index}" for index in row_indices], index=row_indices, dtype="string")
+        if id_column in data.columns:
+            question_ids = text_column(id_column)[mask].fillna(fallback_ids)
+        else:
+            question_ids = fallback_ids
+        
+        if comment_column in data.columns:
+            comments = text_column(comment_column)[mask]
+            comments = comments.astype(object).where((comments.ne("") & comments.ne("nan")).fillna(False), None).to_numpy()
+        else:
+            comments = np.full(len(row_indices), None, dtype=object)
+        
+        return {
+            'question_ids': question_ids.to_numpy(dtype=object),
+            'questions': questions[mask].to_numpy(dtype=object),
+            'answers': answers[mask].to_numpy(dtype=object),
+            'comments': comments,
+            'row_indices': row_indices.to_numpy()
+        }
+    
+    def _detect_csv_encoding(self, block_size: int = 1 << 20) -> str:
+        """Bestimmt das Encoding der CSV-Datei blockweise, ohne sie ganz in den Speicher zu laden"""
+        for encoding in CSV_ENCODINGS:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                with open(self.file_path, 'rb') as f:
+                    while block := f.read(block_size):
+                        decoder.decode(block)
+                    decoder.decode(b'', final=True)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        
+        raise ValueError("Kein passendes Encoding gefunden")
+    
+    def iter_qa_columns(self,
+                        chunk_rows: int = 50_000,
+                        id_column: str = 'ID',
+                        question_column: str = 'Frage',
+                        answer_column: str = 'Antwort',
+                        comment_column: str = 'Kommentar') -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Liefert die gültigen Frage-Antwort-Zeilen blockweise (je chunk_rows Zeilen)
+        
+        CSV-Dateien werden dabei gestreamt, ohne self.data zu setzen - der Speicherbedarf
+        hängt nur von der Blockgröße ab. Bereits geladene Daten bzw. Excel-Dateien
+        (werden vollständig per read_file() gelesen) werden in gleich große Blöcke geteilt.
+        Jeder Block hat dieselben Schlüssel wie get_data_for_embeddings().
+        """
+        columns = (id_column, question_column, answer_column, comment_column)
+        total_pairs = 0
+        
+        if self.data is None and self.file_extension == '.csv':
+            encoding = self._detect_csv_encoding()
+            logger.info("Lese CSV-Datei blockweise (%d Zeilen, Encoding: %s): %s", chunk_rows, encoding, self.file_path)
+            
+            # Alle Spalten als Text lesen, damit die Typ-Inferenz (z.B. IDs "1" vs. "1.0")
+            # nicht je Block unterschiedlich ausfällt
+            with pd.read_csv(self.file_path, encoding=encoding, dtype=str, chunksize=chunk_rows) as chunks:
+                for chunk in chunks:
+                    chunk.columns = chunk.columns.str.strip()
+                    qa_columns = self._qa_columns_from_frame(chunk, *columns)
+                    total_pairs += len(qa_columns['row_indices'])
+                    yield qa_columns
+        else:
+            data = self.data if self.data is not None else self.read_file()
+            for start in range(0, len(data), chunk_rows):
+                qa_columns = self._qa_columns_from_frame(data.iloc[start:start + chunk_rows], *columns)
+                total_pairs += len(qa_columns['row_indices'])
+                yield qa_columns
+        
+        logger.info("Erfolgreich %d Frage-Antwort-Paare blockweise extrahiert", total_pairs)
+    
+    def iter_qa_pairs(self,
+                      chunk_rows: int = 50_000,
+                      id_column: str = 'ID',
+                      question_column: str = 'Frage',
+                      answer_column: str = 'Antwort',
+                      comment_column: str = 'Kommentar') -> Iterator[QuestionAnswerPair]:
+        """
+        Liefert Frage-Antwort-Paare blockweise (siehe iter_qa_columns)
+        Für große Dateien, die nicht vollständig in den Speicher passen
+        """
+        for qa_columns in self.iter_qa_columns(chunk_rows, id_column, question_column, answer_column, comment_column):
+            for question_id, question, answer, comment, index in zip(
+                qa_columns['question_ids'].tolist(), qa_columns['questions'].tolist(),
+                qa_columns['answers'].tolist(), qa_columns['comments'].tolist(),
+                qa_columns['row_indices'].tolist()
+            ):
+                yield QuestionAnswerPair(
+                    question_id=question_id,
+                    question=question,
+                    answer=answer,
+                    comment=comment,
+                    row_index=index
+                )
+    
     def extract_qa_pairs(self, 
                          id_column: str = 'ID',
                          question_column: str = 'Frage',
@@ -233,39 +430,35 @@ class DataReader:
         """
         Extrahiert Frage-Antwort-Paare aus den Daten
         Kann in anderen Services für Embeddings verwendet werden
+        
+        Das Ergebnis wird je Spaltenkombination zwischengespeichert, so dass
+        validate_data_quality() nicht erneut extrahiert.
         """
         if self.data is None:
             raise ValueError("Keine Daten geladen. Führe zuerst read_file() aus.")
         
-        qa_pairs = []
-        
-        for index, row in self.data.iterrows():
-            try:
-                # Extrahiere Werte mit Fehlerbehandlung
-                question_id = str(row.get(id_column, f"row_{index}")).strip()
-                question = str(row.get(question_column, "")).strip()
-                answer = str(row.get(answer_column, "")).strip()
-                comment = str(row.get(comment_column, "")).strip() if comment_column in row else None
-                
-                # Validiere, dass Frage und Antwort nicht leer sind
-                if question and answer and question != "nan" and answer != "nan":
-                    qa_pair = QuestionAnswerPair(
-                        question_id=question_id,
-                        question=question,
-                        answer=answer,
-                        comment=comment if comment and comment != "nan" else None,
-                        row_index=index
-                    )
-                    qa_pairs.append(qa_pair)
-                else:
-                    logger.warning(f"Zeile {index}: Leere Frage oder Antwort übersprungen")
-                    
-            except Exception as e:
-                logger.error(f"Fehler beim Verarbeiten der Zeile {index}: {str(e)}")
-                continue
-        
-        logger.info(f"Erfolgreich {len(qa_pairs)} Frage-Antwort-Paare extrahiert")
-        return qa_pairs
+        cache_key = (id_column, question_column, answer_column, comment_column)
+        if self._qa_pairs_cache is not None and self._qa_pairs_cache[0] == cache_key:
+            return list(self._qa_pairs_cache[1])
+        
+        qa_columns = self._extract_qa_columns(*cache_key)
+        qa_pairs = [
+            QuestionAnswerPair(
+                question_id=question_id,
+                question=question,
+                answer=answer,
+                comment=comment,
+                row_index=index
+            )
+            for question_id, question, answer, comment, index in zip(
+                qa_columns['question_ids'].tolist(), qa_columns['questions'].tolist(),
+                qa_columns['answers'].tolist(), qa_columns['comments'].tolist(),
+                qa_columns['row_indices'].tolist()
+            )
+        ]
+        
+        self._qa_pairs_cache = (cache_key, qa_pairs)
+        return list(qa_pairs)
     
     def get_document_metadata(self, 
                              document_id: str,
@@ -279,7 +472,7 @@ class DataReader:
             raise ValueError("Keine Daten geladen. Führe zuerst read_file() aus.")
         
         # Bestimme MIME-Type basierend auf Dateiendung
-        file_extension = self.file_path.suffix.lower()
+        file_extension = self.file_extension
         if file_extension in ['.xlsx', '.xls']:
             mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         elif file_extension == '.csv':
@@ -299,30 +492,39 @@ class DataReader:
         
         return self.metadata
     
-    def get_data_for_embeddings(self) -> Dict[str, Any]:
+    def get_data_for_embeddings(self, chunk_rows: Optional[int] = None) -> Dict[str, Any]:
         """
         Bereitet Daten für Embeddings vor
         Gibt strukturierte Daten zurück, die direkt für Vektorisierung verwendet werden können
+        
+        Die Daten liegen spaltenweise als Arrays vor (questions, answers, question_ids,
+        comments, row_indices; Eintrag i gehört jeweils zum selben QA-Paar).
+        
+        Args:
+            chunk_rows: Wenn gesetzt, wird die Datei blockweise gelesen (iter_qa_columns)
+                        und read_file() ist nicht erforderlich
         """
-        if self.data is None:
+        if chunk_rows is not None:
+            blocks = list(self.iter_qa_columns(chunk_rows))
+            qa_columns = {
+                key: np.concatenate([block[key] for block in blocks]) if blocks else np.empty(0, dtype=object)
+                for key in ('question_ids', 'questions', 'answers', 'comments', 'row_indices')
+            }
+        elif self.data is None:
             raise ValueError("Keine Daten geladen. Führe zuerst read_file() aus.")
+        else:
+            qa_columns = self._extract_qa_columns()
         
-        qa_pairs = self.extract_qa_pairs()
+        file_stat = self.file_path.stat()
         
         # Strukturiere Daten für Embeddings
         embedding_data = {
-            'questions': [qa.question for qa in qa_pairs],
-            'answers': [qa.answer for qa in qa_pairs],
-            'metadata': [{
-                'question_id': qa.question_id,
-                'row_index': qa.row_index,
-                'comment': qa.comment
-            } for qa in qa_pairs],
-            'total_pairs': len(qa_pairs),
+            **qa_columns,
+            'total_pairs': len(qa_columns['questions']),
             'document_info': {
                 'file_path': str(self.file_path),
-                'file_size': self.file_path.stat().st_size,
-                'last_modified': datetime.fromtimestamp(self.file_path.stat().st_mtime)
+                'file_size': file_stat.st_size,
+                'last_modified': datetime.fromtimestamp(file_stat.st_mtime)
             }
         }
         
@@ -332,17 +534,22 @@ class DataReader:
         """
         Validiert die Datenqualität für Vektorisierung
         Gibt Warnungen und Empfehlungen zurück
+        
+        'text_lengths' enthält je Fragen/Antworten Maximum, Mittelwert, 99%-Perzentil
+        und die Anzahl Texte über dem Längenlimit (1000 bzw. 2000 Zeichen).
         """
         if self.data is None:
             raise ValueError("Keine Daten geladen. Führe zuerst read_file() aus.")
         
-        qa_pairs = self.extract_qa_pairs()
+        # Spalten-Arrays statt QuestionAnswerPair-Objekten (keine Dataclass je Zeile nötig)
+        qa_columns = self._extract_qa_columns()
+        valid_pairs = len(qa_columns['questions'])
         
         quality_report = {
             'total_rows': len(self.data),
-            'valid_qa_pairs': len(qa_pairs),
-            'invalid_rows': len(self.data) - len(qa_pairs),
-            'quality_score': (len(qa_pairs) / len(self.data)) * 100 if len(self.data) > 0 else 0,
+            'valid_qa_pairs': valid_pairs,
+            'invalid_rows': len(self.data) - valid_pairs,
+            'quality_score': (valid_pairs / len(self.data)) * 100 if len(self.data) > 0 else 0,
             'warnings': [],
             'recommendations': []
         }
@@ -353,14 +560,30 @@ class DataReader:
             quality_report['recommendations'].append("Daten vor der Vektorisierung bereinigen")
         
         # Prüfe Textlängen für Embeddings
-        question_lengths = [len(qa.question) for qa in qa_pairs]
-        answer_lengths = [len(qa.answer) for qa in qa_pairs]
+        question_lengths = np.fromiter(map(len, qa_columns['questions']), dtype=np.int64, count=valid_pairs)
+        answer_lengths = np.fromiter(map(len, qa_columns['answers']), dtype=np.int64, count=valid_pairs)
+        
+        def length_stats(lengths: np.ndarray, max_length: int) -> Dict[str, Any]:
+            """Kennzahlen eines Längen-Arrays (leeres Array: alles 0)"""
+            if lengths.size == 0:
+                return {'max': 0, 'mean': 0.0, 'p99': 0.0, 'over_limit': 0}
+            return {
+                'max': int(lengths.max()),
+                'mean': float(lengths.mean()),
+                'p99': float(np.percentile(lengths, 99)),
+                'over_limit': int((lengths > max_length).sum())
+            }
         
-        if max(question_lengths) > 1000:
+        quality_report['text_lengths'] = {
+            'questions': length_stats(question_lengths, 1000),
+            'answers': length_stats(answer_lengths, 2000)
+        }
+        
+        if quality_report['text_lengths']['questions']['over_limit'] > 0:
             quality_report['warnings'].append("Sehr lange Fragen gefunden - könnten Embedding-Qualität beeinträchtigen")
             quality_report['recommendations'].append("Fragen auf maximale Länge kürzen")
         
-        if max(answer_lengths) > 2000:
+        if quality_report['text_lengths']['answers']['over_limit'] > 0:
             quality_report['warnings'].append("Sehr lange Antworten gefunden - könnten Embedding-Qualität beeinträchtigen")
             quality_report['recommendations'].append("Antworten auf maximale Länge kürzen")
         
@@ -384,8 +607,8 @@ class DataReader:
             report.append(f"SPALTE: {column}")
             report.append("-" * 40)
             report.append(f"Dominanter Datentyp: {analysis['dominant_type']}")
-            report.append(f"NULL-Werte: {analysis['null_count']} ({analysis['null_count']/analysis['total_count']*100:.1f}%)")
-            report.append(f"Leere Werte: {analysis['empty_count']} ({analysis['empty_count']/analysis['total_count']*100:.1f}%)")
+            report.append(f"NULL-Werte: {analysis['null_count']} ({analysis['null_pct']*100:.1f}%)")
+            report.append(f"Leere Werte: {analysis['empty_count']} ({analysis['empty_pct']*100:.1f}%)")
             report.append(f"Eindeutige Werte: {analysis['unique_count']}")
             report.append(f"Datentyp-Verteilung:")
             
@@ -410,21 +633,21 @@ class DataReader:
             column_score = 100
             
             # Abzug für NULL-Werte
-            null_percentage = analysis['null_count'] / analysis['total_count']
+            null_percentage = analysis['null_pct']
             if null_percentage > 0.1:  # Mehr als 10% NULL
                 column_score -= 30
             elif null_percentage > 0.05:  # Mehr als 5% NULL
                 column_score -= 15
             
             # Abzug für leere Werte
-            empty_percentage = analysis['empty_count'] / analysis['total_count']
+            empty_percentage = analysis['empty_pct']
             if empty_percentage > 0.2:  # Mehr als 20% leer
                 column_score -= 20
             elif empty_percentage > 0.1:  # Mehr als 10% leer
                 column_score -= 10
             
             # Bonus für konsistente Datentypen
-            dominant_percentage = analysis['type_distribution'][analysis['dominant_type']] / analysis['total_count']
+            dominant_percentage = analysis['dominant_pct']
             if dominant_percentage > 0.9:  # Mehr als 90% einheitlich
                 column_score += 10
             
@@ -447,14 +670,13 @@ def create_qa_dataset_from_file(file_path: str,
     metadata = reader.get_document_metadata(document_id, document_source)
     return qa_pairs, metadata
 
-def get_embedding_data_from_file(file_path: str) -> Dict[str, Any]:
+def get_embedding_data_from_file(file_path: str, chunk_rows: int = 50_000) -> Dict[str, Any]:
     """
     Einfache Hilfsfunktion für andere Services
-    Gibt Daten direkt für Embeddings zurück
+    Gibt Daten direkt für Embeddings zurück (CSV-Dateien werden blockweise gelesen)
     """
     reader = DataReader(file_path)
-    reader.read_file()
-    return reader.get_data_for_embeddings()
+    return reader.get_data_for_embeddings(chunk_rows=chunk_rows)
 
 def validate_file_for_ingestion(file_path: str) -> Dict[str, Any]:
     """
@@ -485,6 +707,16 @@ def main():
     
     args = parser.parse_args()
     
+    # Logging konfigurieren
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('data_reader.log', encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    
     try:
         # Daten einlesen
         reader = DataReader(args.file_path)
@@ -521,7 +753,7 @@ def main():
             print(f"Embedding-Daten vorbereitet:")
             print(f"  Fragen: {len(embedding_data['questions'])}")
             print(f"  Antworten: {len(embedding_data['answers'])}")
-            print(f"  Metadaten: {len(embedding_data['metadata'])}")
+            print(f"  Fragen-IDs: {len(embedding_data['question_ids'])}")
             print()
         
         # Detaillierten Bericht
@@ -543,7 +775,7 @@ def main():
                   f"Leer: {analysis['empty_count']})")
     
     except Exception as e:
-        logger.error(f"Fehler: {str(e)}")
+        logger.error("Fehler: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -7,21 +7,70 @@ Zeigt, wie QA-Daten für Embeddings vorbereitet werden können
 
 from data_reader import (
     DataReader, 
-    create_qa_dataset_from_file, 
-    get_embedding_data_from_file,
-    validate_file_for_ingestion,
     DocumentMetadata,
     QuestionAnswerPair
 )
 import logging
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 import uuid
-from datetime import datetime
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _process_document(file_path: str,
+                      document_source: str,
+                      document_class: str = "qa_dataset") -> Tuple[Dict[str, Any], List[QuestionAnswerPair]]:
+    """
+    Liest und validiert ein Dokument und bereitet es für Embeddings vor
+    Modulebene, damit die Funktion auch in Worker-Prozessen laufen kann (siehe ingest_many)
+    """
+    try:
+        logger.info(f"Starte Verarbeitung von: {file_path}")
+        
+        # Datei einmal einlesen, alle weiteren Schritte arbeiten auf demselben Reader
+        reader = DataReader(file_path)
+        reader.read_file()
+        
+        # 1. Dokument validieren
+        reader.analyze_data()
+        quality_score = reader.get_data_quality_score()
+        quality_report = reader.validate_data_quality()
+        logger.info(f"Datenqualitäts-Score: {quality_score:.1f}/100")
+        
+        # 2. QA-Daten extrahieren
+        qa_pairs = reader.extract_qa_pairs()
+        metadata = reader.get_document_metadata(
+            document_id=str(uuid.uuid4()),  # Generiere eindeutige ID
+            document_source=document_source,
+            document_class=document_class
+        )
+        
+        # 3. Daten für Embeddings vorbereiten
+        embedding_data = reader.get_data_for_embeddings()
+        
+        result = {
+            'document_id': metadata.document_id,
+            'document_source': metadata.document_source,
+            'document_class': metadata.document_class,
+            'document_mime_type': metadata.document_mime_type,
+            'created_at': metadata.created_at,
+            'total_rows': metadata.total_rows,
+            'total_columns': metadata.total_columns,
+            'qa_pairs_count': len(qa_pairs),
+            'quality_score': quality_score,
+            'embedding_data': embedding_data,
+            'validation_warnings': quality_report['warnings'],
+            'validation_recommendations': quality_report['recommendations']
+        }
+        
+        return result, qa_pairs
+        
+    except Exception as e:
+        logger.error(f"Fehler bei der Verarbeitung von {file_path}: {str(e)}")
+        raise
+
 class IngestionService:
     """Beispiel-Ingestion-Service, der den DataReader integriert"""
     
@@ -36,56 +85,52 @@ class IngestionService:
         """
         Verarbeitet ein Dokument und bereitet es für Embeddings vor
         """
-        try:
-            logger.info(f"Starte Verarbeitung von: {file_path}")
-            
-            # 1. Dokument validieren
-            validation_result = validate_file_for_ingestion(file_path)
-            logger.info(f"Datenqualitäts-Score: {validation_result['quality_score']:.1f}/100")
-            
-            # 2. QA-Daten extrahieren
-            qa_pairs, metadata = create_qa_dataset_from_file(
-                file_path=file_path,
-                document_id=str(uuid.uuid4()),  # Generiere eindeutige ID
-                document_source=document_source
-            )
-            
-            # 3. Daten für Embeddings vorbereiten
-            embedding_data = get_embedding_data_from_file(file_path)
-            
-            # 4. Metadaten aktualisieren
-            metadata.document_class = document_class
-            metadata.created_at = datetime.now()
-            
-            # 5. Ergebnisse speichern
-            result = {
-                'document_id': metadata.document_id,
-                'document_source': metadata.document_source,
-                'document_class': metadata.document_class,
-                'document_mime_type': metadata.document_mime_type,
-                'created_at': metadata.created_at,
-                'total_rows': metadata.total_rows,
-                'total_columns': metadata.total_columns,
-                'qa_pairs_count': len(qa_pairs),
-                'quality_score': validation_result['quality_score'],
-                'embedding_data': embedding_data,
-                'validation_warnings': validation_result['quality_report']['warnings'],
-                'validation_recommendations': validation_result['quality_report']['recommendations']
-            }
-            
-            # 6. In Service speichern
-            self.processed_documents.append(result)
-            self.qa_datasets.extend(qa_pairs)
-            
-            logger.info(f"✓ Dokument erfolgreich verarbeitet: {metadata.document_id}")
-            logger.info(f"  QA-Paare: {len(qa_pairs)}")
-            logger.info(f"  Qualität: {validation_result['quality_score']:.1f}/100")
-            
-            return result
+        result, qa_pairs = _process_document(file_path, document_source, document_class)
+        self._store_result(result, qa_pairs)
+        return result
+    
+    def ingest_many(self,
+                    file_paths: List[str],
+                    document_sources: List[str],
+                    document_class: str = "qa_dataset",
+                    max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Verarbeitet mehrere Dokumente parallel in einem Prozess-Pool
+        
+        Einlesen und Analyse sind CPU-gebunden, die Dokumente sind voneinander
+        unabhängig. Die Ergebnisse werden in der Reihenfolge von file_paths
+        gespeichert und zurückgegeben.
+        
+        Args:
+            file_paths: Pfade der Dokumente
+            document_sources: Quelle je Dokument (gleiche Länge wie file_paths)
+            document_class: Dokumentklasse für alle Dokumente
+            max_workers: Anzahl Worker-Prozesse (None: Anzahl CPUs)
             
-        except Exception as e:
-            logger.error(f"Fehler bei der Verarbeitung von {file_path}: {str(e)}")
-            raise
+        Returns:
+            List[Dict[str, Any]]: Ergebnis je Dokument wie bei ingest_document()
+        """
+        if len(file_paths) != len(document_sources):
+            raise ValueError("file_paths und document_sources müssen gleich lang sein")
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result, qa_pairs in executor.map(
+                _process_document, file_paths, document_sources, [document_class] * len(file_paths)
+            ):
+                self._store_result(result, qa_pairs)
+                results.append(result)
+        
+        return results
+    
+    def _store_result(self, result: Dict[str, Any], qa_pairs: List[QuestionAnswerPair]) -> None:
+        """Speichert das Ergebnis eines verarbeiteten Dokuments im Service"""
+        self.processed_documents.append(result)
+        self.qa_datasets.extend(qa_pairs)
+        
+        logger.info(f"✓ Dokument erfolgreich verarbeitet: {result['document_id']}")
+        logger.info(f"  QA-Paare: {len(qa_pairs)}")
+        logger.info(f"  Qualität: {result['quality_score']:.1f}/100")
     
     def get_questions_for_embedding(self, document_id: str = None) -> List[str]:
         """
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests für das Overlap-Verhalten des TableChunkingService
+Ausführen aus dem Repository-Wurzelverzeichnis: python -m unittest tests.test_table_chunking_service
+"""
+
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from integration.table_chunking_service import TableChunkingService
+
+
+def build_content(answer_lengths):
+    """Inhalt im Format von TableExtractionService._prepare_content_for_chunking"""
+    blocks = [
+        f"## Frage {index}\n\n**Frage:** Frage {index}\n\n**Antwort:** {'a' * length}\n\n---\n"
+        for index, length in enumerate(answer_lengths)
+    ]
+    qa_pairs = [{'row_id': str(index)} for index in range(len(answer_lengths))]
+    return "\n".join(["# FAQ-Daten aus Excel (Tabellenblatt: FAQ)", "", *blocks]), qa_pairs
+
+
+class TableChunkingOverlapTest(unittest.TestCase):
+
+    def assert_consistent(self, chunks):
+        """Jeder Chunk enthält genau die QA-Blöcke seiner qa_pairs"""
+        for chunk in chunks:
+            self.assertEqual(re.findall(r'^## Frage (\d+)', chunk.content, re.MULTILINE),
+                             [qa_pair['row_id'] for qa_pair in chunk.qa_pairs])
+            self.assertEqual(chunk.metadata['qa_pairs_count'], len(chunk.qa_pairs))
+
+    def test_answers_longer_than_overlap_are_not_carried(self):
+        content, qa_pairs = build_content([1500] * 4)
+        with_overlap = TableChunkingService()._split_content_into_chunks(content, qa_pairs)
+        without_overlap = TableChunkingService(overlap=0)._split_content_into_chunks(content, qa_pairs)
+
+        self.assertEqual([chunk.content for chunk in with_overlap],
+                         [chunk.content for chunk in without_overlap])
+        self.assertTrue(all(chunk.metadata['overlap_qa_pairs'] == 0 for chunk in with_overlap))
+        self.assert_consistent(with_overlap)
+
+    def test_overlap_carries_whole_blocks_within_limit(self):
+        content, qa_pairs = build_content([10] * 12)
+        service = TableChunkingService(max_chunk_size=200, overlap=100)
+        chunks = service._split_content_into_chunks(content, qa_pairs)
+
+        self.assertGreater(len(chunks), 1)
+        self.assert_consistent(chunks)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            carried = chunk.metadata['overlap_qa_pairs']
+            self.assertGreater(carried, 0)
+            self.assertTrue(chunk.content.startswith("## Frage"))
+            self.assertEqual(chunk.qa_pairs[:carried], previous.qa_pairs[-carried:])
+            carried_text = previous.content[previous.content.index(f"## Frage {chunk.qa_pairs[0]['row_id']}\n"):]
+            self.assertLessEqual(len(carried_text), service.overlap)
+
+
+if __name__ == "__main__":
+    unittest.main()